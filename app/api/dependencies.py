@@ -3,7 +3,7 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from app.core.auth import decode_access_token
+from app.core.auth import decode_access_token_cached
 
 security = HTTPBearer()
 
@@ -19,7 +19,7 @@ async def get_current_user(
     )
     
     try:
-        username = decode_access_token(credentials.credentials)
+        username = decode_access_token_cached(credentials.credentials)
         if username is None:
             raise credentials_exception
         return username
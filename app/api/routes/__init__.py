@@ -4,9 +4,10 @@ from fastapi import APIRouter
 
 router = APIRouter()
 
-from . import dogs, users, auth, files
+from . import dogs, users, auth, files, tasks
 
 router.include_router(dogs.router, prefix="/dogs", tags=["dogs"])
 router.include_router(users.router, prefix="/users", tags=["users"])
 router.include_router(auth.router, prefix="/auth", tags=["auth"])
-router.include_router(files.router, prefix="/files", tags=["files"])
\ No newline at end of file
+router.include_router(files.router, prefix="/files", tags=["files"])
+router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
\ No newline at end of file
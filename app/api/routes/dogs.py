@@ -1,26 +1,124 @@
 """Dog routes following REST principles."""
 
-from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
+import json
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional, Union
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks, Query, Body
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from app.api.dependencies import get_current_user
-from app.schemas.dog import DogCreate, DogUpdate, DogResponse
-from app.services.dog_service import DogService
-from app.tasks.dog_tasks import create_dog_async
+from app.config.redis import get_redis
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.responses import ORJSONResponse
+from app.models.dog import Dog
+from app.schemas.dog import (
+    DogBulkUpdate, DogCreate, DogNameSuggestions, DogResponse, DogSearchResults,
+    DogUpdate, DogWithUser
+)
+from app.schemas.pagination import Page
+from app.services.dog_service import (
+    SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT, DogInclude, DogSearchMode, DogService
+)
+from app.services.task_events import publish_task_event
+from app.services.export_service import (
+    DOG_EXPORT_COLUMNS, MEDIA_TYPES, ExportFormat, stream_export
+)
+from app.config.settings import settings
+
+# Celery and the task modules are imported on first use so that API workers
+# start without loading them
 
 router = APIRouter()
 
+# Items a bulk creation rejected up front, kept next to the batch results
+BULK_REJECTED_KEY = "dogs:bulk:{batch_id}:rejected"
+
+
+@router.get("/", response_model=Page[Union[DogWithUser, DogResponse]])
+async def get_dogs(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    is_adopted: Optional[bool] = None,
+    id_user: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    include: Optional[DogInclude] = None
+):
+    """Get a page of dogs, optionally filtered, with their owners if ``include=user``."""
+    try:
+        page = await DogService.get_all_dogs(
+            limit=limit,
+            cursor=cursor,
+            is_adopted=is_adopted,
+            id_user=id_user,
+            created_after=created_after,
+            include=include
+        )
+        return ORJSONResponse(page)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/is_adopted", response_model=Page[Union[DogWithUser, DogResponse]])
+async def get_adopted_dogs(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    id_user: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    include: Optional[DogInclude] = None
+):
+    """Get a page of adopted dogs, with their owners if ``include=user``."""
+    try:
+        page = await DogService.get_adopted_dogs(
+            limit=limit,
+            cursor=cursor,
+            id_user=id_user,
+            created_after=created_after,
+            include=include
+        )
+        return ORJSONResponse(page)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
 
-@router.get("/", response_model=List[DogResponse])
-async def get_dogs():
-    """Get all dogs."""
-    return await DogService.get_all_dogs()
+@router.get("/export")
+async def export_dogs(
+    format: ExportFormat = ExportFormat.ndjson,
+    after_id: int = Query(0, ge=0),
+    is_adopted: Optional[bool] = None
+):
+    """Stream all dogs as NDJSON or CSV, resuming after ``after_id``."""
+    queryset = Dog.all()
+    if is_adopted is not None:
+        queryset = queryset.filter(is_adopted=is_adopted)
+    return StreamingResponse(
+        stream_export(queryset, DOG_EXPORT_COLUMNS, format, after_id),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=dogs.{format.value}"}
+    )
 
 
-@router.get("/is_adopted", response_model=List[DogResponse])
-async def get_adopted_dogs():
-    """Get all adopted dogs."""
-    return await DogService.get_adopted_dogs()
+@router.get("/search", response_model=Union[DogSearchResults, DogNameSuggestions])
+async def search_dogs(
+    q: str = Query(..., min_length=1, max_length=100),
+    mode: DogSearchMode = DogSearchMode.fuzzy,
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT)
+):
+    """Search dogs by name.
+    
+    ``mode=fuzzy`` returns ranked dogs matching ``q`` with typos allowed;
+    ``mode=prefix`` returns just the names starting with ``q``, for
+    autocomplete.
+    """
+    return ORJSONResponse(await DogService.search(q, mode, limit))
 
 
 @router.get("/{name}", response_model=DogResponse)
@@ -35,6 +133,125 @@ async def get_dog_by_name(name: str):
     return dog
 
 
+@router.post("/bulk", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+async def create_dogs_bulk(
+    dogs_data: List[DogCreate] = Body(..., max_length=settings.max_bulk_create_items),
+    current_user: str = Depends(get_current_user)
+):
+    """Create many dogs as batched async tasks (protected route with JWT).
+    
+    At most ``MAX_BULK_CREATE_ITEMS`` dogs are accepted per request.
+    """
+    rejected = []
+    accepted = []
+    seen = set()
+    for dog_data in dogs_data:
+        if dog_data.name in seen:
+            rejected.append({
+                "name": dog_data.name,
+                "status": "failed",
+                "error": "Duplicate name in request"
+            })
+            continue
+        seen.add(dog_data.name)
+        accepted.append(dog_data)
+    
+    # Check name uniqueness with one query per batch, which keeps each
+    # query well below the driver's bind parameter limit
+    names = list(seen)
+    batch_size = settings.bulk_create_batch_size
+    existing = set()
+    for i in range(0, len(names), batch_size):
+        existing.update(
+            await Dog.filter(name__in=names[i:i + batch_size]).values_list("name", flat=True)
+        )
+    if existing:
+        rejected.extend(
+            {
+                "name": dog_data.name,
+                "status": "failed",
+                "error": f"Dog with name '{dog_data.name}' already exists"
+            }
+            for dog_data in accepted
+            if dog_data.name in existing
+        )
+        accepted = [d for d in accepted if d.name not in existing]
+    
+    if not accepted:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "No dogs to create", "rejected": rejected}
+        )
+    
+    batches = [
+        [dog_data.dict() for dog_data in accepted[i:i + batch_size]]
+        for i in range(0, len(accepted), batch_size)
+    ]
+    from celery import group
+    from app.tasks.celery_app import celery_app
+    from app.tasks.dog_tasks import create_dogs_bulk_async
+    
+    # Publishing and saving the group talk to the broker and result backend
+    batch = await run_in_threadpool(
+        group(create_dogs_bulk_async.s(dogs) for dogs in batches).apply_async
+    )
+    if rejected:
+        # Stored before the batch can be restored, so polling always sees them
+        await get_redis().set(
+            BULK_REJECTED_KEY.format(batch_id=batch.id),
+            json.dumps(rejected),
+            ex=celery_app.conf.result_expires
+        )
+    await run_in_threadpool(batch.save)
+    
+    return {
+        "message": f"Creation of {len(accepted)} dogs started",
+        "batch_id": batch.id,
+        "accepted": len(accepted),
+        "rejected": rejected,
+        "status": "processing"
+    }
+
+
+@router.get("/bulk/{batch_id}", response_model=dict)
+async def get_bulk_status(batch_id: str):
+    """Get per-item results of a bulk creation batch.
+    
+    Items rejected when the batch was created are listed first.
+    """
+    from celery.result import GroupResult
+    from app.tasks.celery_app import celery_app
+    
+    batch = await run_in_threadpool(GroupResult.restore, batch_id, app=celery_app)
+    if batch is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Batch '{batch_id}' not found"
+        )
+    
+    rejected = await get_redis().get(BULK_REJECTED_KEY.format(batch_id=batch_id))
+    
+    def _collect():
+        items = json.loads(rejected) if rejected else []
+        pending = 0
+        for result in batch.results:
+            if not result.ready():
+                pending += 1
+            elif result.successful():
+                items.extend(result.result["items"])
+            else:
+                items.append({"status": "failed", "error": str(result.result)})
+        return items, pending
+    
+    items, pending = await run_in_threadpool(_collect)
+    return {
+        "batch_id": batch_id,
+        "status": "processing" if pending else "completed",
+        "pending_tasks": pending,
+        "items": items
+    }
+
+
 @router.post("/{name}", response_model=dict)
 async def create_dog(
     name: str,
@@ -45,7 +262,8 @@ async def create_dog(
     # Override name from path parameter
     dog_data.name = name
     
-    # Check if dog already exists
+    # Check if dog already exists; a concurrent create of the same name is
+    # caught by the unique constraint and reported as a failed task event
     existing_dog = await DogService.get_dog_by_name(name)
     if existing_dog:
         raise HTTPException(
@@ -53,11 +271,21 @@ async def create_dog(
             detail=f"Dog with name '{name}' already exists"
         )
     
+    # Record the queued state before the worker can report progress
+    task_id = str(uuid.uuid4())
+    await publish_task_event(task_id, "queued", name=dog_data.name)
+    
     # Start async task
-    task = create_dog_async.delay(
-        name=dog_data.name,
-        is_adopted=dog_data.is_adopted,
-        id_user=dog_data.id_user
+    from app.tasks.dog_tasks import create_dog_async
+    
+    task = create_dog_async.apply_async(
+        kwargs={
+            "name": dog_data.name,
+            "is_adopted": dog_data.is_adopted,
+            "id_user": dog_data.id_user
+        },
+        task_id=task_id,
+        headers={"enqueued_at": time.time()}
     )
     
     return {
@@ -85,6 +313,26 @@ async def update_dog(name: str, dog_data: DogUpdate):
         )
 
 
+@router.patch("/", response_model=dict)
+async def update_dogs_bulk(
+    update: DogBulkUpdate,
+    current_user: str = Depends(get_current_user)
+):
+    """Update many dogs in one transaction (protected route with JWT).
+    
+    Send per-dog ``items`` (``[{"name": "rex", "is_adopted": true}]``) or a
+    ``filter`` with the ``changes`` for every matching dog, e.g.
+    ``{"filter": {"names": [...]}, "changes": {"is_adopted": true, "id_user": 42}}``.
+    """
+    try:
+        return await DogService.bulk_update(update)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.delete("/{name}", response_model=dict)
 async def delete_dog(name: str):
     """Delete dog by name."""
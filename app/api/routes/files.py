@@ -1,46 +1,95 @@
 """File upload routes and worker status."""
 
+import asyncio
+import json
 import os
-import uuid
-from typing import Dict
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
+import time
+from typing import Dict, Optional
+from fastapi import APIRouter, HTTPException, status, Query, Request, Header
+from fastapi.concurrency import run_in_threadpool
 
-from app.tasks.dog_tasks import get_worker_status
+from app.config.redis import get_redis
+from app.config.settings import settings
+from app.core.responses import RangeFileResponse
+from app.models.file import FileUpload
+from app.schemas.file import UploadSessionCreate
+from app.services.file_storage import (
+    ChecksumMismatchError, InvalidUploadError, UploadTooLargeError, blob_path, delete_upload,
+    save_upload
+)
+from app.services.image_reservoir import reservoir_stats
+from app.services.upload_sessions import (
+    SessionBusyError, abort_session, complete_session, create_session, get_session,
+    write_chunk
+)
 
 router = APIRouter()
 
+# Allowance for multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
 
-@router.post("/files", response_model=Dict[str, str])
-async def upload_file(file: UploadFile = File(...)):
-    """Upload a file with any extension."""
-    if not file.filename:
+
+# Request body of upload_file, which parses the multipart stream itself so
+# the file goes straight to disk instead of being spooled first
+UPLOAD_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "required": ["file"],
+                "properties": {"file": {"type": "string", "format": "binary"}},
+            }
+        }
+    },
+}
+
+
+@router.post("/files", response_model=dict, openapi_extra={"requestBody": UPLOAD_REQUEST_BODY})
+async def upload_file(
+    request: Request,
+    content_sha256: Optional[str] = Header(None, alias="X-Content-SHA256")
+):
+    """Upload a file with any extension.
+    
+    Contents are deduplicated by SHA-256. Clients that send the digest in
+    ``X-Content-SHA256`` skip the disk write entirely for known content.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() \
+            and int(content_length) > settings.max_upload_size + MULTIPART_OVERHEAD:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No file provided"
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds maximum size of {settings.max_upload_size} bytes"
         )
     
-    # Create uploads directory if it doesn't exist
-    upload_dir = "uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    # Generate unique filename
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(upload_dir, unique_filename)
-    
     # Save file
     try:
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        stored = await save_upload(
+            request.stream(),
+            request.headers.get("content-type", ""),
+            content_sha256.lower() if content_sha256 else None
+        )
         
         return {
             "message": "File uploaded successfully",
-            "filename": file.filename,
-            "saved_as": unique_filename,
-            "size": len(content),
-            "content_type": file.content_type or "unknown"
+            "filename": stored["filename"],
+            "saved_as": stored["saved_as"],
+            "size": stored["size"],
+            "sha256": stored["sha256"],
+            "deduplicated": stored["deduplicated"],
+            "content_type": stored["content_type"]
         }
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except (ChecksumMismatchError, InvalidUploadError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -48,15 +97,224 @@ async def upload_file(file: UploadFile = File(...)):
         )
 
 
-@router.get("/workers", response_model=Dict[str, str])
+@router.post("/files/uploads", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def create_upload_session(session_data: UploadSessionCreate):
+    """Start a resumable upload; chunks are then PUT by index."""
+    try:
+        return await create_session(
+            filename=session_data.filename,
+            size=session_data.size,
+            content_type=session_data.content_type,
+            sha256=session_data.sha256
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+
+
+@router.get("/files/uploads/{upload_id}", response_model=dict)
+async def get_upload_session(upload_id: str):
+    """Get received and missing chunks of a resumable upload."""
+    session = await get_session(upload_id)
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Upload '{upload_id}' not found"
+        )
+    return session
+
+
+@router.put("/files/uploads/{upload_id}/chunks/{index}", response_model=dict)
+async def upload_chunk(upload_id: str, index: int, request: Request):
+    """Write one chunk of a resumable upload at its offset.
+    
+    Chunks can be sent in any order or in parallel, and re-sent after a
+    dropped connection.
+    """
+    try:
+        chunk = await write_chunk(upload_id, index, request.stream())
+    except SessionBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if chunk is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Upload '{upload_id}' not found"
+        )
+    return chunk
+
+
+@router.post("/files/uploads/{upload_id}/complete", response_model=dict)
+async def complete_upload_session(upload_id: str):
+    """Assemble a resumable upload once every chunk was received."""
+    try:
+        stored = await complete_session(upload_id)
+    except SessionBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Upload '{upload_id}' not found"
+        )
+    return {"message": "File uploaded successfully", **stored}
+
+
+@router.delete("/files/uploads/{upload_id}", response_model=dict)
+async def abort_upload_session(upload_id: str):
+    """Abort a resumable upload and discard its chunks."""
+    if not await abort_session(upload_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Upload '{upload_id}' not found"
+        )
+    return {"message": f"Upload '{upload_id}' aborted"}
+
+
+@router.api_route("/files/{saved_as}", methods=["GET", "HEAD"])
+async def download_file(saved_as: str):
+    """Download an uploaded file.
+    
+    Supports single and multi-part ``Range`` requests and conditional
+    requests through the content digest ETag and Last-Modified.
+    """
+    upload = await FileUpload.filter(id=saved_as).select_related("blob").first()
+    if upload is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File '{saved_as}' not found"
+        )
+    
+    digest = upload.blob.digest
+    path = blob_path(digest)
+    try:
+        stat = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File '{saved_as}' not found"
+        )
+    
+    accel_redirect = None
+    if settings.upload_accel_redirect_prefix:
+        accel_redirect = settings.upload_accel_redirect_prefix.rstrip("/") + "/" \
+            + os.path.relpath(path, settings.upload_dir)
+    
+    return RangeFileResponse(
+        path=path,
+        size=stat.st_size,
+        last_modified=stat.st_mtime,
+        etag=f'"{digest}"',
+        media_type=upload.content_type if upload.content_type != "unknown" else None,
+        filename=upload.filename,
+        accel_redirect=accel_redirect
+    )
+
+
+@router.delete("/files/{saved_as}", response_model=dict)
+async def delete_file(saved_as: str):
+    """Delete an uploaded file."""
+    if not await delete_upload(saved_as):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"File '{saved_as}' not found"
+        )
+    return {"message": f"File '{saved_as}' deleted successfully"}
+
+
+@router.get("/workers", response_model=dict)
 async def check_worker_status():
-    """Check if Celery worker is functioning."""
+    """Check Celery workers from their last published heartbeats.
+    
+    Nodes that missed three heartbeats are dropped from the hash, so workers
+    killed without a clean shutdown do not stay listed.
+    """
+    from app.tasks.heartbeat import HEARTBEATS_KEY
+    
+    redis = get_redis()
     try:
-        task = get_worker_status.delay()
-        result = task.get(timeout=10)  # Wait up to 10 seconds
-        return result
+        heartbeats = await redis.hgetall(HEARTBEATS_KEY)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Worker status not available: {str(e)}"
+        )
+    
+    stale_after = time.time() - 3 * settings.worker_heartbeat_interval
+    workers = []
+    stale = []
+    for hostname, heartbeat in heartbeats.items():
+        worker = json.loads(heartbeat)
+        if worker["last_seen"] >= stale_after:
+            workers.append(worker)
+        else:
+            stale.append(hostname)
+    if stale:
+        # A live node that was only late re-adds itself on its next heartbeat
+        try:
+            await redis.hdel(HEARTBEATS_KEY, *stale)
+        except Exception:
+            pass
+    if not workers:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Worker not available: no recent heartbeats"
+        )
+    return {
+        "status": "Worker is functioning correctly",
+        "queue_depth": max(worker["queue_depth"] for worker in workers),
+        "active_tasks": sum(worker["active_tasks"] for worker in workers),
+        "workers": workers
+    }
+
+
+@router.get("/workers/probe", response_model=dict)
+async def probe_workers(timeout: float = Query(10.0, gt=0, le=60)):
+    """Round-trip a task through a worker without blocking the event loop."""
+    from app.tasks.dog_tasks import get_worker_status
+    
+    task = await run_in_threadpool(get_worker_status.delay)
+    deadline = time.monotonic() + timeout
+    while not await run_in_threadpool(task.ready):
+        if time.monotonic() >= deadline:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Worker not available: no reply within {timeout}s"
+            )
+        await asyncio.sleep(0.1)
+    
+    try:
+        return await run_in_threadpool(task.get, timeout=0)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Worker not available: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/reservoir", response_model=Dict[str, float])
+async def get_reservoir_stats():
+    """Get depth and refill rate of the prefetched dog image reservoir."""
+    try:
+        return await reservoir_stats()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Reservoir not available: {str(e)}"
+        )
@@ -0,0 +1,93 @@
+"""Task status routes with push updates over SSE and WebSocket."""
+
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.services.task_events import get_task_state, stream_task_events
+
+router = APIRouter()
+
+# Celery states mapped to the states published by task events
+CELERY_STATES = {
+    "RECEIVED": "queued",
+    "STARTED": "started",
+    "RETRY": "started",
+    "SUCCESS": "succeeded",
+    "FAILURE": "failed",
+    "REVOKED": "failed",
+}
+
+
+@router.get("/{task_id}", response_model=dict)
+async def get_task(task_id: str):
+    """Get the current state of a task."""
+    event = await get_task_state(task_id)
+    if event is not None:
+        return event
+    
+    # Tasks that do not publish events: ask the result backend
+    from celery.result import AsyncResult
+    from app.tasks.celery_app import celery_app
+    
+    result = AsyncResult(task_id, app=celery_app)
+    state = await run_in_threadpool(lambda: result.state)
+    if state not in CELERY_STATES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task '{task_id}' not found"
+        )
+    return {"task_id": task_id, "state": CELERY_STATES[state]}
+
+
+@router.get("/{task_id}/events")
+async def task_events(task_id: str):
+    """Stream state changes of a task as Server-Sent Events."""
+    
+    async def _events():
+        async for event in stream_task_events(task_id):
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {event['state']}\ndata: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/{task_id}/ws")
+async def task_events_ws(websocket: WebSocket, task_id: str):
+    """Push state changes of a task over a WebSocket.
+    
+    The socket is read while events are pushed so a client that goes away
+    ends the Redis subscription right away, not on the next event.
+    """
+    await websocket.accept()
+    
+    async def _push_events():
+        async for event in stream_task_events(task_id):
+            if event is not None:
+                await websocket.send_json(event)
+        await websocket.close()
+    
+    async def _wait_for_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    
+    done, pending = await asyncio.wait(
+        {asyncio.create_task(_push_events()), asyncio.create_task(_wait_for_disconnect())},
+        return_when=asyncio.FIRST_COMPLETED
+    )
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    for task in done:
+        error = task.exception()
+        if error is not None and not isinstance(error, WebSocketDisconnect):
+            raise error
\ No newline at end of file
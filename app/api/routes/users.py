@@ -1,33 +1,87 @@
 """User routes with basic CRUD operations."""
 
-from typing import List
-from fastapi import APIRouter, HTTPException, status
+from datetime import datetime
+from typing import Optional, Union
+from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from tortoise.exceptions import DoesNotExist, IntegrityError
 
+from app.core.cache import cache
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
+from app.core.replicas import replica_reads
+from app.core.responses import ORJSONResponse
+from app.models.dog import Dog
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserWithDogs
+from app.schemas.pagination import Page
+from app.schemas.user import (
+    USER_RESPONSE_COLUMNS, UserCreate, UserUpdate, UserResponse, UserWithDogs
+)
+from app.services.dog_service import DogService, UserInclude
+from app.services.export_service import (
+    USER_EXPORT_COLUMNS, MEDIA_TYPES, ExportFormat, stream_export
+)
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[UserResponse])
-async def get_users():
-    """Get all users."""
-    users = await User.all()
-    return [UserResponse.from_orm(user) for user in users]
+@router.get("/", response_model=Page[Union[UserWithDogs, UserResponse]])
+@replica_reads
+async def get_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    include: Optional[UserInclude] = None
+):
+    """Get a page of users, with their dogs if ``include=dogs``."""
+    queryset = User.all()
+    if created_after is not None:
+        queryset = queryset.filter(created_at__gt=created_after)
+    
+    try:
+        users, next_cursor = await paginate(
+            queryset, limit, cursor, columns=USER_RESPONSE_COLUMNS
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if include == UserInclude.dogs:
+        await DogService.attach_dogs(users)
+    return ORJSONResponse({"items": users, "next_cursor": next_cursor})
+
+
+@router.get("/export")
+async def export_users(
+    format: ExportFormat = ExportFormat.ndjson,
+    after_id: int = Query(0, ge=0)
+):
+    """Stream all users as NDJSON or CSV, resuming after ``after_id``."""
+    return StreamingResponse(
+        stream_export(User.all(), USER_EXPORT_COLUMNS, format, after_id),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=users.{format.value}"}
+    )
 
 
 @router.get("/{user_id}", response_model=UserWithDogs)
+@replica_reads(cached=True)
 async def get_user_by_id(user_id: int):
     """Get user by ID with their dogs."""
-    try:
-        user = await User.get(id=user_id).prefetch_related("dogs")
-        return UserWithDogs.from_orm(user)
-    except DoesNotExist:
+    
+    async def _load():
+        user = await User.filter(id=user_id).first().values(**USER_RESPONSE_COLUMNS)
+        if user is not None:
+            await DogService.attach_dogs([user])
+        return user
+    
+    user = await cache.get_or_load("user", user_id, _load)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User with id {user_id} not found"
         )
+    return ORJSONResponse(user)
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
@@ -57,6 +111,8 @@ async def update_user(user_id: int, user_data: UserUpdate):
         if update_data:
             await user.update_from_dict(update_data)
             await user.save()
+            # Adopted dog pages may embed this user
+            await DogService.invalidate_cache(user_ids=[user_id])
         
         return UserResponse.from_orm(user)
     except DoesNotExist:
@@ -76,7 +132,10 @@ async def delete_user(user_id: int):
     """Delete user by ID."""
     try:
         user = await User.get(id=user_id)
+        # Deleting a user clears id_user on their dogs
+        dog_names = await Dog.filter(id_user_id=user_id).values_list("name", flat=True)
         await user.delete()
+        await DogService.invalidate_cache(dog_names, [user_id], adopted=bool(dog_names))
         return {"message": f"User with id {user_id} deleted successfully"}
     except DoesNotExist:
         raise HTTPException(
@@ -1,25 +1,95 @@
 """Database configuration using Tortoise ORM."""
 
-from tortoise import Tortoise
+from typing import Any, Dict, Union
+
+from tortoise import Tortoise, connections
+from tortoise.backends.base.config_generator import expand_db_url
 from tortoise.contrib.fastapi import register_tortoise
+from tortoise.utils import generate_schema_for_client
 
 from app.config.settings import settings
 
-TORTOISE_ORM = {
-    "connections": {"default": settings.database_url},
-    "apps": {
-        "models": {
-            "models": ["app.models.dog", "app.models.user", "aerich.models"],
-            "default_connection": "default",
-        },
+# Read replicas are extra connections; only routed reads use them
+REPLICA_CONNECTIONS = {
+    f"replica_{i}": url.strip()
+    for i, url in enumerate(
+        url for url in settings.database_replica_urls.split(",") if url.strip()
+    )
+}
+
+# Pool settings of the API process and of each Celery worker process
+POOL_SIZES = {
+    "api": {
+        "minsize": settings.db_pool_min_size,
+        "maxsize": settings.db_pool_max_size,
+        "acquire_timeout": settings.db_pool_acquire_timeout,
+    },
+    "worker": {
+        "minsize": settings.worker_db_pool_min_size,
+        "maxsize": settings.worker_db_pool_max_size,
+        "acquire_timeout": settings.worker_db_pool_acquire_timeout,
     },
 }
 
 
-async def init_db():
+def connection_config(url: str, role: str = "api") -> Union[str, Dict[str, Any]]:
+    """Expand a Postgres URL into a pooled connection config for ``role``.
+    
+    Options already given in the URL query string take precedence. Other
+    databases (SQLite in development and benchmarks) are used as-is.
+    """
+    config = expand_db_url(url)
+    if config["engine"] != "tortoise.backends.asyncpg":
+        return url
+    
+    config["engine"] = "app.core.db_pool"
+    pool = {
+        **POOL_SIZES[role],
+        "max_queries": settings.db_pool_max_queries,
+        "max_inactive_connection_lifetime": settings.db_pool_max_inactive_lifetime,
+        "statement_cache_size": settings.db_statement_cache_size,
+    }
+    for key, value in pool.items():
+        config["credentials"].setdefault(key, value)
+    return config
+
+
+def tortoise_config(role: str = "api") -> Dict[str, Any]:
+    """Tortoise config with the pool settings of the given process role."""
+    return {
+        "connections": {
+            alias: connection_config(url, role)
+            for alias, url in {"default": settings.database_url, **REPLICA_CONNECTIONS}.items()
+        },
+        "routers": ["app.core.replicas.ReplicaRouter"] if REPLICA_CONNECTIONS else [],
+        "apps": {
+            "models": {
+                "models": [
+                    "app.models.dog",
+                    "app.models.user",
+                    "app.models.file",
+                    "aerich.models",
+                ],
+                "default_connection": "default",
+            },
+        },
+    }
+
+
+TORTOISE_ORM = tortoise_config("api")
+WORKER_TORTOISE_ORM = tortoise_config("worker")
+
+
+async def generate_schemas():
+    """Create missing tables on the primary; replicas are read-only."""
+    await generate_schema_for_client(connections.get("default"), safe=True)
+
+
+async def init_db(config: Dict[str, Any] = TORTOISE_ORM):
     """Initialize database connection."""
-    await Tortoise.init(config=TORTOISE_ORM)
-    await Tortoise.generate_schemas()
+    await Tortoise.init(config=config)
+    if settings.generate_schemas:
+        await generate_schemas()
 
 
 async def close_db():
@@ -32,6 +102,9 @@ def register_db(app):
     register_tortoise(
         app,
         config=TORTOISE_ORM,
-        generate_schemas=True,
+        generate_schemas=False,
         add_exception_handlers=True,
-    )
\ No newline at end of file
+    )
+    
+    if settings.generate_schemas:
+        app.on_event("startup")(generate_schemas)
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""Redis client configuration."""
+
+from typing import Optional
+
+import redis.asyncio as redis
+
+from app.config.settings import settings
+
+_redis: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Get the process-wide async Redis client."""
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(settings.redis_url, decode_responses=True)
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the Redis client and its connection pool."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
@@ -9,6 +9,35 @@ class Settings(BaseSettings):
     # Database
     database_url: str = config("DATABASE_URL")
     test_database_url: str = config("TEST_DATABASE_URL", default="")
+    # Comma-separated read replica URLs; empty sends every query to the primary
+    database_replica_urls: str = config("DATABASE_REPLICA_URLS", default="")
+    replica_max_lag: float = config("REPLICA_MAX_LAG", default=5.0, cast=float)
+    replica_check_interval: float = config("REPLICA_CHECK_INTERVAL", default=5.0, cast=float)
+    # How long a client reads from the primary after its last write
+    replica_sticky_seconds: int = config("REPLICA_STICKY_SECONDS", default=10, cast=int)
+    
+    # Database pools (Postgres); every API and worker process has its own
+    db_pool_min_size: int = config("DB_POOL_MIN_SIZE", default=1, cast=int)
+    db_pool_max_size: int = config("DB_POOL_MAX_SIZE", default=5, cast=int)
+    # Seconds to wait for a free connection; 0 waits forever
+    db_pool_acquire_timeout: float = config("DB_POOL_ACQUIRE_TIMEOUT", default=10.0, cast=float)
+    # Prefork worker processes run one task at a time
+    worker_db_pool_min_size: int = config("WORKER_DB_POOL_MIN_SIZE", default=1, cast=int)
+    worker_db_pool_max_size: int = config("WORKER_DB_POOL_MAX_SIZE", default=2, cast=int)
+    worker_db_pool_acquire_timeout: float = config(
+        "WORKER_DB_POOL_ACQUIRE_TIMEOUT",
+        default=30.0,
+        cast=float
+    )
+    # Connections are replaced after this many queries or idle seconds
+    db_pool_max_queries: int = config("DB_POOL_MAX_QUERIES", default=50000, cast=int)
+    db_pool_max_inactive_lifetime: float = config(
+        "DB_POOL_MAX_INACTIVE_LIFETIME",
+        default=300.0,
+        cast=float
+    )
+    # Set to 0 behind pgbouncer in transaction pooling mode
+    db_statement_cache_size: int = config("DB_STATEMENT_CACHE_SIZE", default=100, cast=int)
     
     # Redis
     redis_url: str = config("REDIS_URL")
@@ -21,15 +50,100 @@ class Settings(BaseSettings):
         default=30, 
         cast=int
     )
+    token_cache_size: int = config("TOKEN_CACHE_SIZE", default=1024, cast=int)
     
     # External APIs
     dog_ceo_api_url: str = config(
         "DOG_CEO_API_URL", 
         default="https://dog.ceo/api/breeds/image/random"
     )
+    dog_ceo_connect_timeout: float = config(
+        "DOG_CEO_CONNECT_TIMEOUT",
+        default=5.0,
+        cast=float
+    )
+    dog_ceo_read_timeout: float = config("DOG_CEO_READ_TIMEOUT", default=10.0, cast=float)
+    dog_ceo_max_connections: int = config("DOG_CEO_MAX_CONNECTIONS", default=100, cast=int)
+    dog_ceo_max_keepalive_connections: int = config(
+        "DOG_CEO_MAX_KEEPALIVE_CONNECTIONS",
+        default=20,
+        cast=int
+    )
+    dog_ceo_http2: bool = config("DOG_CEO_HTTP2", default=False, cast=bool)
+    
+    # Workers
+    worker_heartbeat_interval: float = config(
+        "WORKER_HEARTBEAT_INTERVAL",
+        default=10.0,
+        cast=float
+    )
+    
+    # Metrics
+    metrics_enabled: bool = config("METRICS_ENABLED", default=True, cast=bool)
+    # Port of the worker's /metrics server; 0 disables it
+    worker_metrics_port: int = config("WORKER_METRICS_PORT", default=9808, cast=int)
+    
+    # Read cache
+    cache_enabled: bool = config("CACHE_ENABLED", default=True, cast=bool)
+    cache_local_max_entries: int = config(
+        "CACHE_LOCAL_MAX_ENTRIES",
+        default=10000,
+        cast=int
+    )
+    cache_local_ttl: float = config("CACHE_LOCAL_TTL", default=30.0, cast=float)
+    cache_redis_ttl: int = config("CACHE_REDIS_TTL", default=300, cast=int)
+    
+    # Dog image reservoir
+    image_reservoir_size: int = config("IMAGE_RESERVOIR_SIZE", default=500, cast=int)
+    image_reservoir_refill_interval: float = config(
+        "IMAGE_RESERVOIR_REFILL_INTERVAL",
+        default=30.0,
+        cast=float
+    )
+    
+    # Bulk dog creation
+    bulk_create_batch_size: int = config("BULK_CREATE_BATCH_SIZE", default=500, cast=int)
+    max_bulk_create_items: int = config("MAX_BULK_CREATE_ITEMS", default=5000, cast=int)
+    bulk_picture_concurrency: int = config(
+        "BULK_PICTURE_CONCURRENCY",
+        default=20,
+        cast=int
+    )
+    
+    # File uploads
+    upload_dir: str = config("UPLOAD_DIR", default="uploads")
+    upload_chunk_size: int = config("UPLOAD_CHUNK_SIZE", default=1024 * 1024, cast=int)
+    max_upload_size: int = config(
+        "MAX_UPLOAD_SIZE",
+        default=100 * 1024 * 1024,
+        cast=int
+    )
+    max_resumable_upload_size: int = config(
+        "MAX_RESUMABLE_UPLOAD_SIZE",
+        default=10 * 1024 * 1024 * 1024,
+        cast=int
+    )
+    upload_session_chunk_size: int = config(
+        "UPLOAD_SESSION_CHUNK_SIZE",
+        default=8 * 1024 * 1024,
+        cast=int
+    )
+    upload_session_ttl: int = config("UPLOAD_SESSION_TTL", default=24 * 3600, cast=int)
+    # nginx internal location mapped to UPLOAD_DIR; enables X-Accel-Redirect downloads
+    upload_accel_redirect_prefix: str = config("UPLOAD_ACCEL_REDIRECT_PREFIX", default="")
+    
+    # Exports
+    export_chunk_size: int = config("EXPORT_CHUNK_SIZE", default=1000, cast=int)
     
     # Environment
     environment: str = config("ENVIRONMENT", default="development")
+    # In production schemas are only managed by aerich migrations
+    generate_schemas: bool = config(
+        "GENERATE_SCHEMAS",
+        default=config("ENVIRONMENT", default="development") != "production",
+        cast=bool
+    )
+    readiness_timeout: float = config("READINESS_TIMEOUT", default=2.0, cast=float)
     
     # CORS
     allowed_origins: list = ["*"]
@@ -1,7 +1,11 @@
 """Authentication core functionality."""
 
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Dict, Optional, Tuple
 
 from jose import JWTError, jwt
 from pydantic import BaseModel
@@ -20,22 +24,107 @@ class Token(BaseModel):
     token_type: str
 
 
-def decode_access_token(token: str) -> Optional[str]:
-    """Decode access token and return username."""
+class TokenCache:
+    """Bounded, thread-safe LRU of verified tokens keyed by their SHA-256.
+    
+    Entries hold the token subject and its ``exp`` claim and are only
+    returned until the token expires, so a cached token is never accepted
+    after ``jwt.decode`` would have rejected it.
+    """
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+    
+    def get(self, token: str) -> Optional[str]:
+        """Get the cached subject of a still valid token."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                subject, expires_at = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return subject
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, token: str, subject: str, expires_at: float) -> None:
+        """Remember a verified token until ``expires_at``."""
+        if self.max_size <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (subject, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Get size and hit/miss counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = TokenCache(settings.token_cache_size)
+
+
+def _decode_payload(token: str) -> Optional[dict]:
+    """Verify a token and return its claims."""
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             token, 
             settings.secret_key, 
             algorithms=[settings.algorithm]
         )
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
     except JWTError:
         return None
 
 
+def decode_access_token(token: str) -> Optional[str]:
+    """Decode access token and return username."""
+    payload = _decode_payload(token)
+    if payload is None:
+        return None
+    return payload.get("sub")
+
+
+def decode_access_token_cached(token: str) -> Optional[str]:
+    """Decode access token, reusing the result of earlier verifications."""
+    username = token_cache.get(token)
+    if username is not None:
+        return username
+    
+    payload = _decode_payload(token)
+    if payload is None:
+        return None
+    username = payload.get("sub")
+    if username is not None and payload.get("exp") is not None:
+        token_cache.put(token, username, float(payload["exp"]))
+    return username
+
+
 def create_token_for_user(username: str) -> dict:
     """Create token for user."""
     from app.core.security import create_access_token
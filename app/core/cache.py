@@ -0,0 +1,229 @@
+"""Two-tier read cache: in-process LRU/TTL in front of a shared Redis tier.
+
+Entries live in namespaces (``"dog"``, ``"user"``, ...). Writers invalidate
+single keys or a whole namespace; invalidations delete the Redis entries and
+are broadcast over pub/sub so every process drops its local copy as well.
+Redis failures degrade to local-only caching instead of failing requests.
+
+Reads go through ``get_or_load``. Every invalidation bumps a generation, per
+namespace in Redis and per process locally, and a loaded value is only
+written back if neither changed while it was loading, so an invalidation
+that races a load always wins.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import orjson
+from redis.exceptions import RedisError, WatchError
+
+from app.config.redis import get_redis
+from app.config.settings import settings
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+logger = logging.getLogger(__name__)
+
+
+class TwoTierCache:
+    """Cache with a per-process LRU/TTL tier and a shared Redis tier."""
+    
+    def __init__(self, max_entries: int, local_ttl: float, redis_ttl: int):
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.origin = uuid.uuid4().hex
+        self._local: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        # Bumped whenever local entries are dropped
+        self._generation = 0
+    
+    @staticmethod
+    def _redis_key(namespace: str, key: str) -> str:
+        return f"cache:{namespace}:{key}"
+    
+    @staticmethod
+    def _index_key(namespace: str) -> str:
+        return f"cache:{namespace}:__keys__"
+    
+    @staticmethod
+    def _generation_key(namespace: str) -> str:
+        return f"cache:{namespace}:__generation__"
+    
+    def _get_local(self, namespace: str, key: str) -> Optional[Any]:
+        entry = self._local.get((namespace, key))
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._local[(namespace, key)]
+            return None
+        self._local.move_to_end((namespace, key))
+        return value
+    
+    def _set_local(self, namespace: str, key: str, value: Any) -> None:
+        self._local[(namespace, key)] = (time.monotonic() + self.local_ttl, value)
+        self._local.move_to_end((namespace, key))
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+    
+    def _drop_local(self, namespace: str, keys: Optional[Iterable[str]]) -> None:
+        self._generation += 1
+        if keys is None:
+            for cached in [k for k in self._local if k[0] == namespace]:
+                del self._local[cached]
+            return
+        for key in keys:
+            self._local.pop((namespace, key), None)
+    
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: Hashable,
+        load: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        """Get a value from the local tier, then from Redis, then from ``load``.
+        
+        A loaded JSON-serializable value is stored in both tiers unless the
+        namespace was invalidated meanwhile. ``None`` results are not cached.
+        """
+        if not settings.cache_enabled:
+            return await load()
+        key = str(key)
+        value = self._get_local(namespace, key)
+        if value is not None:
+            return value
+        
+        local_generation = self._generation
+        redis_key = self._redis_key(namespace, key)
+        try:
+            raw, generation = await get_redis().mget(
+                redis_key, self._generation_key(namespace)
+            )
+            redis_available = True
+        except RedisError as e:
+            logger.warning("Cache read error: %s", e)
+            raw, generation, redis_available = None, None, False
+        if raw is not None:
+            value = orjson.loads(raw)
+            if self._generation == local_generation:
+                self._set_local(namespace, key, value)
+            return value
+        
+        value = await load()
+        if value is None:
+            return None
+        if redis_available and not await self._set_redis(namespace, redis_key, value, generation):
+            return value
+        if self._generation == local_generation:
+            self._set_local(namespace, key, value)
+        return value
+    
+    async def _set_redis(
+        self, namespace: str, redis_key: str, value: Any, generation: Optional[str]
+    ) -> bool:
+        """Store a value in Redis unless the namespace generation moved on.
+        
+        Returns False when an invalidation happened since ``generation`` was
+        read. Redis errors are logged and count as stored.
+        """
+        generation_key = self._generation_key(namespace)
+        try:
+            async with get_redis().pipeline(transaction=True) as pipe:
+                await pipe.watch(generation_key)
+                if await pipe.get(generation_key) != generation:
+                    return False
+                pipe.multi()
+                pipe.set(redis_key, orjson.dumps(value, option=orjson.OPT_UTC_Z), ex=self.redis_ttl)
+                pipe.sadd(self._index_key(namespace), redis_key)
+                pipe.expire(self._index_key(namespace), self.redis_ttl)
+                await pipe.execute()
+        except WatchError:
+            return False
+        except RedisError as e:
+            logger.warning("Cache write error: %s", e)
+        return True
+    
+    async def invalidate(self, namespace: str, *keys: Hashable) -> None:
+        """Drop specific keys of a namespace from every process."""
+        keys = [str(key) for key in keys if key is not None]
+        if not keys or not settings.cache_enabled:
+            return
+        self._drop_local(namespace, keys)
+        try:
+            redis = get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                redis_keys = [self._redis_key(namespace, key) for key in keys]
+                pipe.delete(*redis_keys)
+                pipe.srem(self._index_key(namespace), *redis_keys)
+                pipe.incr(self._generation_key(namespace))
+                pipe.publish(INVALIDATION_CHANNEL, self._message(namespace, keys))
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Cache invalidation error: %s", e)
+    
+    async def invalidate_namespace(self, namespace: str) -> None:
+        """Drop every key of a namespace from every process."""
+        if not settings.cache_enabled:
+            return
+        self._drop_local(namespace, None)
+        try:
+            redis = get_redis()
+            index_key = self._index_key(namespace)
+            redis_keys = await redis.smembers(index_key)
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.delete(index_key, *redis_keys)
+                pipe.incr(self._generation_key(namespace))
+                pipe.publish(INVALIDATION_CHANNEL, self._message(namespace, None))
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Cache invalidation error: %s", e)
+    
+    def _message(self, namespace: str, keys: Optional[list]) -> str:
+        return json.dumps({"origin": self.origin, "namespace": namespace, "keys": keys})
+    
+    def _clear_local(self) -> None:
+        self._local.clear()
+        self._generation += 1
+    
+    def _apply_message(self, message: Dict[str, Any]) -> None:
+        try:
+            data = json.loads(message["data"])
+            if data["origin"] != self.origin:
+                self._drop_local(data["namespace"], data["keys"])
+        except (ValueError, KeyError, TypeError):
+            logger.exception("Ignoring malformed cache invalidation: %r", message.get("data"))
+    
+    async def listen(self) -> None:
+        """Apply invalidations published by other processes until cancelled.
+        
+        The local tier is cleared on every (re)subscription, since
+        invalidations published while not subscribed are lost.
+        """
+        while True:
+            try:
+                pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                try:
+                    self._clear_local()
+                    async for message in pubsub.listen():
+                        self._apply_message(message)
+                finally:
+                    await pubsub.aclose()
+            except RedisError as e:
+                logger.warning("Cache invalidation listener error: %s", e)
+            except Exception:
+                logger.exception("Cache invalidation listener failed")
+            # Local entries may be stale until the listener is back
+            self._clear_local()
+            await asyncio.sleep(1)
+
+cache = TwoTierCache(
+    max_entries=settings.cache_local_max_entries,
+    local_ttl=settings.cache_local_ttl,
+    redis_ttl=settings.cache_redis_ttl,
+)
@@ -0,0 +1,92 @@
+"""Tortoise engine for Postgres with a metered asyncpg pool.
+
+Used as the ``engine`` of Postgres connections built by
+``app.config.database.connection_config``. It behaves like
+``tortoise.backends.asyncpg`` except that waiting for a pool connection is
+bounded by ``acquire_timeout`` and the pool size, idle connections, waiters
+and acquire latency are published as Prometheus metrics.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+import asyncpg
+from tortoise.backends.asyncpg import AsyncpgDBClient
+from tortoise.exceptions import DBConnectionError
+
+from app.core.metrics import observe_pool, observe_pool_acquire
+
+
+class PoolTimeoutError(DBConnectionError):
+    """Raised when no pool connection frees up within the acquire timeout.
+    
+    This is local saturation, not a failure of the database server.
+    """
+
+
+class MeteredPool(asyncpg.Pool):
+    """asyncpg pool that times acquisitions and applies a default timeout."""
+    
+    def __init__(self, *args, name: str, acquire_timeout: Optional[float], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.name = name
+        self.acquire_timeout = acquire_timeout
+        self.waiters = 0
+    
+    def observe(self) -> None:
+        observe_pool(
+            self.name, self.get_size(), self.get_idle_size(), self.get_max_size(), self.waiters
+        )
+    
+    async def _acquire(self, timeout):
+        # Both pool.acquire() and transactions end up here
+        timeout = timeout or self.acquire_timeout
+        self.waiters += 1
+        self.observe()
+        start = time.perf_counter()
+        try:
+            connection = await super()._acquire(timeout)
+        except asyncio.TimeoutError:
+            observe_pool_acquire(self.name, time.perf_counter() - start, timed_out=True)
+            raise PoolTimeoutError(
+                f"No connection free in the '{self.name}' pool after {timeout}s "
+                f"({self.get_max_size()} in use)"
+            )
+        finally:
+            self.waiters -= 1
+            self.observe()
+        observe_pool_acquire(self.name, time.perf_counter() - start)
+        return connection
+    
+    async def release(self, connection, *, timeout=None):
+        try:
+            await super().release(connection, timeout=timeout)
+        finally:
+            self.observe()
+
+
+class MeteredAsyncpgClient(AsyncpgDBClient):
+    """Asyncpg client whose pool is a ``MeteredPool``."""
+    
+    async def create_pool(self, **kwargs) -> asyncpg.Pool:
+        acquire_timeout = float(kwargs.pop("acquire_timeout", 0)) or None
+        pool = MeteredPool(
+            None,
+            name=self.connection_name,
+            acquire_timeout=acquire_timeout,
+            record_class=asyncpg.Record,
+            **kwargs
+        )
+        await pool
+        pool.observe()
+        return pool
+    
+    async def _close(self) -> None:
+        pool = self._pool
+        await super()._close()
+        if pool is not None:
+            observe_pool(pool.name, 0, 0, 0, 0)
+
+
+client_class = MeteredAsyncpgClient
@@ -0,0 +1,289 @@
+"""Prometheus metrics.
+
+Request counts, latencies and in-flight requests are recorded per route
+template by ``MetricsMiddleware``. Database queries are timed by wrapping the
+Tortoise client methods once at startup and counted per request through a
+context variable. Everything is a no-op when ``METRICS_ENABLED`` is off.
+
+Database pool gauges are summed over processes, so the size totals of the
+API and worker endpoints together can be compared with Postgres
+``max_connections``.
+
+Celery prefork workers record into the same metrics from several processes;
+set ``PROMETHEUS_MULTIPROC_DIR`` so the worker's /metrics server aggregates
+them.
+"""
+
+import functools
+import os
+import time
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+
+from prometheus_client import (
+    REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from app.config.settings import settings
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template.",
+    ["method", "route"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served.",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries issued while serving one request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Database query latency by client method.",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+DOG_CEO_LATENCY = Histogram(
+    "dog_ceo_request_duration_seconds",
+    "dog.ceo API call latency by outcome (success or error).",
+    ["outcome"]
+)
+IMAGE_RESERVOIR_POPS = Counter(
+    "dog_image_reservoir_pops_total",
+    "Dog images requested from the reservoir by outcome (hit or miss).",
+    ["outcome"]
+)
+IMAGE_RESERVOIR_DEPTH = Gauge(
+    "dog_image_reservoir_depth",
+    "Image URLs waiting in the reservoir, as last seen by this process.",
+    multiprocess_mode="livemax"
+)
+IMAGE_RESERVOIR_REFILLED = Counter(
+    "dog_image_reservoir_refilled_total",
+    "Image URLs added to the reservoir by the refiller."
+)
+TASK_LATENCY = Histogram(
+    "celery_task_enqueue_to_completion_seconds",
+    "Time from enqueueing a task to its completion.",
+    ["task", "state"],
+    buckets=(0.5, 1, 2, 2.5, 3, 4, 5, 7.5, 10, 15, 30, 60, 120)
+)
+DB_POOL_SIZE = Gauge(
+    "db_pool_connections",
+    "Open connections in the database pool.",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_IDLE = Gauge(
+    "db_pool_idle_connections",
+    "Open connections not currently in use.",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_MAX_SIZE = Gauge(
+    "db_pool_max_connections",
+    "Configured maximum size of the database pool.",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_WAITERS = Gauge(
+    "db_pool_waiters",
+    "Queries waiting for a free pool connection.",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_ACQUIRE_LATENCY = Histogram(
+    "db_pool_acquire_duration_seconds",
+    "Time spent waiting for a pool connection.",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+DB_POOL_ACQUIRE_TIMEOUTS = Counter(
+    "db_pool_acquire_timeouts_total",
+    "Connection acquisitions that gave up after the acquire timeout.",
+    ["pool"]
+)
+
+# Query counter of the request being served, if any
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar(
+    "request_queries", default=None
+)
+
+_DB_METHODS = (
+    "execute_query", "execute_query_dict", "execute_insert", "execute_many", "execute_script"
+)
+
+
+def _route_template(scope: Scope) -> str:
+    # Recent FastAPI versions keep included routes unprefixed and record the
+    # full path of the matched route separately
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    """Record per-route request metrics.
+    
+    Routes are labelled by their path template (``/api/dogs/{name}``) so the
+    number of series stays bounded; requests no route matched share the
+    ``unmatched`` label.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        queries = [0]
+        token = _request_queries.set(queries)
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            _request_queries.reset(token)
+            template = _route_template(scope)
+            REQUESTS.labels(method, template, str(status_code)).inc()
+            REQUEST_LATENCY.labels(method, template).observe(elapsed)
+            REQUEST_DB_QUERIES.labels(template).observe(queries[0])
+
+
+def _timed_query(method: Callable, operation: str) -> Callable:
+    histogram = DB_QUERY_LATENCY.labels(operation)
+    
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+            queries = _request_queries.get()
+            if queries is not None:
+                queries[0] += 1
+    
+    wrapper._metrics_instrumented = True
+    return wrapper
+
+
+def _with_subclasses(cls: type) -> List[type]:
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(_with_subclasses(subclass))
+    return classes
+
+
+def instrument_tortoise() -> None:
+    """Time every query of the initialized Tortoise connections.
+    
+    The query methods of each client class and its transaction wrappers are
+    wrapped once, so the cost is one extra coroutine frame per query.
+    """
+    if not settings.metrics_enabled:
+        return
+    for connection in connections.all():
+        # Query methods may be inherited from backend base classes
+        bases = [
+            base for base in type(connection).__mro__
+            if issubclass(base, BaseDBAsyncClient) and base is not BaseDBAsyncClient
+        ]
+        for cls in {cls for base in bases for cls in _with_subclasses(base)}:
+            for name in _DB_METHODS:
+                method = cls.__dict__.get(name)
+                if method is None or getattr(method, "_metrics_instrumented", False):
+                    continue
+                setattr(cls, name, _timed_query(method, name))
+
+
+def observe_dog_ceo_call(outcome: str, elapsed: float) -> None:
+    """Record the latency and outcome of one dog.ceo API call."""
+    if settings.metrics_enabled:
+        DOG_CEO_LATENCY.labels(outcome).observe(elapsed)
+
+
+def observe_reservoir_pop(hits: int, misses: int) -> None:
+    """Record images served from the reservoir and requests it could not serve."""
+    if settings.metrics_enabled:
+        if hits:
+            IMAGE_RESERVOIR_POPS.labels("hit").inc(hits)
+        if misses:
+            IMAGE_RESERVOIR_POPS.labels("miss").inc(misses)
+
+
+def observe_reservoir_depth(depth: int, refilled: int = 0) -> None:
+    """Record the reservoir depth after a pop or refill and any URLs added."""
+    if settings.metrics_enabled:
+        IMAGE_RESERVOIR_DEPTH.set(depth)
+        if refilled:
+            IMAGE_RESERVOIR_REFILLED.inc(refilled)
+
+
+def observe_task_completion(task: str, state: str, enqueued_at: Optional[float]) -> None:
+    """Record the enqueue-to-completion time of a task stamped with ``enqueued_at``."""
+    if settings.metrics_enabled and enqueued_at is not None:
+        TASK_LATENCY.labels(task, state).observe(max(time.time() - enqueued_at, 0.0))
+
+
+def observe_pool(
+    pool: str, size: int, idle: int, max_size: int, waiters: int
+) -> None:
+    """Record the current state of a database pool."""
+    if settings.metrics_enabled:
+        DB_POOL_SIZE.labels(pool).set(size)
+        DB_POOL_IDLE.labels(pool).set(idle)
+        DB_POOL_MAX_SIZE.labels(pool).set(max_size)
+        DB_POOL_WAITERS.labels(pool).set(waiters)
+
+
+def observe_pool_acquire(pool: str, elapsed: float, timed_out: bool = False) -> None:
+    """Record the wait for one pool connection."""
+    if settings.metrics_enabled:
+        DB_POOL_ACQUIRE_LATENCY.labels(pool).observe(elapsed)
+        if timed_out:
+            DB_POOL_ACQUIRE_TIMEOUTS.labels(pool).inc()
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Get the registry to expose, merging worker processes in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> bytes:
+    """Render all metrics in the Prometheus text format."""
+    return generate_latest(metrics_registry())
+
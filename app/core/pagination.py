@@ -0,0 +1,54 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from tortoise.queryset import QuerySet
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the id of the last row of a page into an opaque cursor."""
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode an opaque cursor back into the id it points after."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+async def paginate(
+    queryset: QuerySet,
+    limit: int,
+    cursor: Optional[str] = None,
+    columns: Optional[Dict[str, str]] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page of ``queryset`` ordered by primary key.
+
+    Rows are selected with ``id > last_id`` instead of an OFFSET so every page
+    costs the same index range scan. One extra row is requested to know whether
+    a following page exists without a separate COUNT query.
+
+    With ``columns`` (output name to field name) only those columns are
+    selected and rows are returned as dicts instead of model instances.
+    """
+    if cursor:
+        queryset = queryset.filter(id__gt=decode_cursor(cursor))
+    queryset = queryset.order_by("id").limit(limit + 1)
+    rows = await (queryset.values(**columns) if columns else queryset)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_id = rows[-1]["id"] if columns else rows[-1].id
+        next_cursor = encode_cursor(last_id)
+    return rows, next_cursor
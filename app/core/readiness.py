@@ -0,0 +1,51 @@
+"""Readiness of the database and Redis connections.
+
+``/health`` only says the process is up. Readiness additionally requires a
+round trip to the database and to Redis, so a load balancer only routes to
+workers whose connection pools are open.
+"""
+
+import asyncio
+from typing import Dict
+
+from tortoise import connections
+
+from app.config.redis import get_redis
+from app.config.settings import settings
+
+
+async def _check_database() -> None:
+    await connections.get("default").execute_query("SELECT 1")
+
+
+async def _check_redis() -> None:
+    await get_redis().ping()
+
+
+CHECKS = {"database": _check_database, "redis": _check_redis}
+
+
+async def check_dependencies() -> Dict[str, str]:
+    """Run every check concurrently and return ``ok`` or the error for each."""
+    
+    async def _run(check) -> str:
+        try:
+            await asyncio.wait_for(check(), settings.readiness_timeout)
+        except Exception as e:
+            return f"error: {e!r}"
+        return "ok"
+    
+    results = await asyncio.gather(*(_run(check) for check in CHECKS.values()))
+    return dict(zip(CHECKS, results))
+
+
+async def warm_up(ready: asyncio.Event, max_delay: float = 5.0) -> None:
+    """Open the connection pools, retrying with backoff until every check passes."""
+    delay = 0.1
+    while True:
+        results = await check_dependencies()
+        if all(result == "ok" for result in results.values()):
+            ready.set()
+            return
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
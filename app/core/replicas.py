@@ -0,0 +1,198 @@
+"""Read-replica routing for Tortoise.
+
+Functions decorated with ``replica_reads`` run their queries on one healthy
+replica (the same one for the whole call); every other query and every write
+uses the primary ``default`` connection. Replicas are checked in the
+background and skipped while unreachable or lagging more than
+``REPLICA_MAX_LAG`` seconds. A replica that fails during a call is dropped and
+the call is retried on the primary.
+
+Clients that just wrote get a short-lived cookie and read from the primary
+while it lasts, so they always see their own writes.
+"""
+
+import asyncio
+import functools
+import math
+import random
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from tortoise import connections
+from tortoise.exceptions import DBConnectionError, OperationalError
+
+from app.config.database import REPLICA_CONNECTIONS
+from app.config.settings import settings
+from app.core.db_pool import PoolTimeoutError
+
+PRIMARY = "default"
+STICKY_COOKIE = "db_recent_write"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Pool acquire timeouts (PoolTimeoutError) are excluded: they mean this
+# process is saturated, not that the replica failed
+REPLICA_ERRORS = (DBConnectionError, OperationalError, OSError)
+
+# Seconds since the last transaction replayed on a standby, 0 when caught up
+LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END AS lag
+"""
+
+# Connection chosen for the current replica_reads call
+_connection: ContextVar[Optional[str]] = ContextVar("replica_connection", default=None)
+# Whether the current request must read from the primary
+_pinned: ContextVar[bool] = ContextVar("replica_pinned", default=False)
+
+
+class ReplicaSet:
+    """Health and lag of the configured replicas."""
+    
+    def __init__(self, aliases):
+        self.aliases = list(aliases)
+        # Replicas are only used once a check has found them caught up
+        self.healthy = set()
+        self.lag: Dict[str, Optional[float]] = {alias: None for alias in self.aliases}
+    
+    def choose(self) -> Optional[str]:
+        """Pick a healthy replica at random, or None to use the primary."""
+        if not self.healthy:
+            return None
+        return random.choice(sorted(self.healthy))
+    
+    def mark_unhealthy(self, alias: str, error: Exception) -> None:
+        if alias in self.healthy:
+            print(f"Replica {alias} failed, using the primary until it recovers: {error}")
+        self.healthy.discard(alias)
+    
+    async def _lag(self, alias: str) -> float:
+        connection = connections.get(alias)
+        if connection.capabilities.dialect != "postgres":
+            await connection.execute_query("SELECT 1")
+            return 0.0
+        _, rows = await connection.execute_query(LAG_QUERY)
+        return float(rows[0]["lag"] or 0)
+    
+    async def check(self) -> None:
+        """Measure every replica and update the healthy set."""
+        for alias in self.aliases:
+            try:
+                lag = await asyncio.wait_for(self._lag(alias), settings.readiness_timeout)
+            except Exception as e:
+                self.lag[alias] = None
+                self.mark_unhealthy(alias, e)
+                continue
+            self.lag[alias] = lag
+            if lag <= settings.replica_max_lag:
+                self.healthy.add(alias)
+            else:
+                self.healthy.discard(alias)
+    
+    async def monitor(self) -> None:
+        """Re-check the replicas every ``REPLICA_CHECK_INTERVAL`` seconds."""
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.replica_check_interval)
+    
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        return {
+            alias: {"healthy": alias in self.healthy, "lag": self.lag[alias]}
+            for alias in self.aliases
+        }
+
+
+replicas = ReplicaSet(REPLICA_CONNECTIONS)
+
+
+class ReplicaRouter:
+    """Tortoise router sending reads of ``replica_reads`` calls to their replica."""
+    
+    def db_for_read(self, model) -> Optional[str]:
+        return _connection.get()
+    
+    def db_for_write(self, model) -> Optional[str]:
+        return None
+
+
+def replica_reads(func: Optional[Callable] = None, *, cached: bool = False) -> Callable:
+    """Run the queries of a read-only coroutine function on a replica.
+    
+    With ``cached=True`` the function fills the shared read cache, so it uses
+    a replica only while the cache is disabled: a lagging replica could
+    otherwise put rows back into the cache right after a write invalidated
+    them. Nested calls reuse the connection chosen by the outermost one.
+    """
+    if func is None:
+        return functools.partial(replica_reads, cached=cached)
+    
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _connection.get() is not None:
+            return await func(*args, **kwargs)
+        
+        alias = None
+        if not _pinned.get() and not (cached and settings.cache_enabled):
+            alias = replicas.choose()
+        token = _connection.set(alias or PRIMARY)
+        try:
+            return await func(*args, **kwargs)
+        except PoolTimeoutError:
+            raise
+        except REPLICA_ERRORS as e:
+            if alias is None:
+                raise
+            replicas.mark_unhealthy(alias, e)
+        finally:
+            _connection.reset(token)
+        
+        # Retry the read on the primary
+        token = _connection.set(PRIMARY)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _connection.reset(token)
+    
+    return wrapper
+
+
+class ReadYourWritesMiddleware:
+    """Pin clients to the primary for a short window after they write.
+    
+    Successful unsafe requests set a cookie that expires after
+    ``REPLICA_STICKY_SECONDS``; requests carrying it read from the primary.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.cookie = (
+            f"{STICKY_COOKIE}=1; Max-Age={max(math.ceil(settings.replica_sticky_seconds), 1)}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        )
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        cookie_header = next(
+            (value for name, value in scope["headers"] if name == b"cookie"), b""
+        )
+        pinned = STICKY_COOKIE in cookie_parser(cookie_header.decode("latin-1"))
+        is_write = scope["method"] not in SAFE_METHODS
+        
+        async def send_wrapper(message: Message) -> None:
+            if is_write and message["type"] == "http.response.start" \
+                    and message["status"] < 400:
+                MutableHeaders(scope=message).append("set-cookie", self.cookie)
+            await send(message)
+        
+        token = _pinned.set(pinned)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _pinned.reset(token)
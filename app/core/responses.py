@@ -0,0 +1,262 @@
+"""Custom response classes."""
+
+import asyncio
+import os
+import re
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, List, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+import orjson
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import Receive, Scope, Send
+
+ZEROCOPY_EXTENSION = "http.response.zerocopy"
+MAX_RANGES = 16
+_RANGE_RE = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+    
+    Routes return it with plain rows from ``.values()`` to skip
+    ``response_model`` validation of trusted ORM output. UTC datetimes are
+    written with a ``Z`` suffix, matching pydantic's encoding.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def parse_range_header(value: str, size: int) -> Optional[List[Tuple[int, int]]]:
+    """Parse a ``Range`` header into ``(start, end)`` pairs, ``end`` inclusive.
+    
+    Returns None when the header is malformed or not worth honouring (the
+    full file is served instead) and an empty list when no range overlaps
+    the file (416).
+    """
+    unit, _, ranges_spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or not ranges_spec:
+        return None
+    specs = ranges_spec.split(",")
+    if len(specs) > MAX_RANGES:
+        return None
+    
+    ranges = []
+    for spec in specs:
+        match = _RANGE_RE.match(spec)
+        if not match or match.groups() == ("", ""):
+            return None
+        first, last = match.groups()
+        if first == "":
+            # Suffix range: the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if last and int(last) < start:
+                return None
+        if start < size and start <= end:
+            ranges.append((start, end))
+    return ranges
+
+
+def content_disposition(filename: str) -> str:
+    """``attachment`` disposition for any file name.
+    
+    Headers are sent as Latin-1, so names that aren't printable ASCII use the
+    RFC 5987 ``filename*`` form; others are quoted with ``\\`` and ``"``
+    escaped.
+    """
+    if filename.isascii() and filename.isprintable():
+        escaped = filename.replace("\\", "\\\\").replace('"', '\\"')
+        return f'attachment; filename="{escaped}"'
+    return f"attachment; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+class RangeFileResponse(Response):
+    """File response with Range, multipart/byteranges and conditional requests.
+    
+    The body is handed to the server's ``http.response.zerocopy`` extension
+    (sendfile) when the server offers it. When ``accel_redirect`` is set the
+    body is left to a fronting nginx via ``X-Accel-Redirect``, which also uses
+    sendfile and handles ranges itself. Otherwise the file is streamed in
+    chunks read in a worker thread.
+    """
+    
+    chunk_size = 256 * 1024
+    
+    def __init__(
+        self,
+        path: str,
+        size: int,
+        last_modified: float,
+        etag: str,
+        media_type: Optional[str] = None,
+        filename: Optional[str] = None,
+        accel_redirect: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.last_modified = int(last_modified)
+        self.media_type = media_type or "application/octet-stream"
+        self.accel_redirect = accel_redirect
+        self.status_code = 200
+        self.background = None
+        self.body = b""
+        self.raw_headers = []
+        self.init_headers(headers)
+        self.headers["etag"] = etag
+        self.headers["last-modified"] = formatdate(self.last_modified, usegmt=True)
+        self.headers["accept-ranges"] = "bytes"
+        if filename:
+            self.headers["content-disposition"] = content_disposition(filename)
+    
+    def _not_modified(self, request_headers: Headers) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags or f"W/{self.etag}" in tags
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified <= since
+        return False
+    
+    def _range_applies(self, request_headers: Headers) -> bool:
+        if_range = request_headers.get("if-range")
+        if if_range is None:
+            return True
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            return if_range == self.etag
+        try:
+            return parsedate_to_datetime(if_range).timestamp() == self.last_modified
+        except (TypeError, ValueError):
+            return False
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = Headers(scope=scope)
+        send_body = scope.get("method", "GET") != "HEAD"
+        
+        if self._not_modified(request_headers):
+            self.status_code = 304
+            del self.headers["content-type"]
+            await self._start(send, content_length=None)
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        if self.accel_redirect:
+            self.headers["x-accel-redirect"] = self.accel_redirect
+            self.headers["content-type"] = self.media_type
+            await self._start(send, content_length=None)
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        ranges = None
+        range_header = request_headers.get("range")
+        if range_header and self._range_applies(request_headers):
+            ranges = parse_range_header(range_header, self.size)
+        
+        if ranges == []:
+            self.status_code = 416
+            self.headers["content-range"] = f"bytes */{self.size}"
+            await self._start(send, content_length=0)
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        if not ranges:
+            self.headers["content-type"] = self.media_type
+            await self._start(send, content_length=self.size)
+            if send_body:
+                await self._send_file(scope, send, [(0, self.size - 1)], [b""], b"")
+            else:
+                await send({"type": "http.response.body", "body": b""})
+            return
+        
+        self.status_code = 206
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            self.headers["content-type"] = self.media_type
+            self.headers["content-range"] = f"bytes {start}-{end}/{self.size}"
+            await self._start(send, content_length=end - start + 1)
+            prefixes, trailer = [b""], b""
+        else:
+            boundary = uuid.uuid4().hex
+            self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+            prefixes = [
+                (
+                    f"--{boundary}\r\n"
+                    f"Content-Type: {self.media_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{self.size}\r\n\r\n"
+                ).encode()
+                for start, end in ranges
+            ]
+            # Every part after the first starts on a new line
+            prefixes = prefixes[:1] + [b"\r\n" + prefix for prefix in prefixes[1:]]
+            trailer = f"\r\n--{boundary}--\r\n".encode()
+            await self._start(
+                send,
+                content_length=sum(len(p) for p in prefixes)
+                + sum(end - start + 1 for start, end in ranges)
+                + len(trailer)
+            )
+        
+        if send_body:
+            await self._send_file(scope, send, ranges, prefixes, trailer)
+        else:
+            await send({"type": "http.response.body", "body": b""})
+    
+    async def _start(self, send: Send, content_length: Optional[int]) -> None:
+        if content_length is not None:
+            self.headers["content-length"] = str(content_length)
+        elif "content-length" in self.headers:
+            del self.headers["content-length"]
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+    
+    async def _send_file(
+        self,
+        scope: Scope,
+        send: Send,
+        ranges: List[Tuple[int, int]],
+        prefixes: List[bytes],
+        trailer: bytes,
+    ) -> None:
+        zerocopy = ZEROCOPY_EXTENSION in scope.get("extensions", {})
+        fd = await asyncio.to_thread(os.open, self.path, os.O_RDONLY)
+        try:
+            for (start, end), prefix in zip(ranges, prefixes):
+                if prefix:
+                    await send({"type": "http.response.body", "body": prefix, "more_body": True})
+                count = end - start + 1
+                if zerocopy:
+                    await send({
+                        "type": ZEROCOPY_EXTENSION,
+                        "file": fd,
+                        "offset": start,
+                        "count": count,
+                        "more_body": True,
+                    })
+                    continue
+                offset = start
+                while offset <= end:
+                    block = await asyncio.to_thread(
+                        os.pread, fd, min(self.chunk_size, end - offset + 1), offset
+                    )
+                    if not block:
+                        break
+                    offset += len(block)
+                    await send({"type": "http.response.body", "body": block, "more_body": True})
+            await send({"type": "http.response.body", "body": trailer, "more_body": False})
+        finally:
+            await asyncio.to_thread(os.close, fd)
@@ -1,11 +1,21 @@
 """Main FastAPI application."""
 
-from fastapi import FastAPI
+import asyncio
+
+from fastapi import FastAPI, HTTPException, Response, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from app.config.database import register_db
 from app.config.settings import settings
-from app.api.routes import auth, dogs, users, files
+from app.config.redis import close_redis
+from app.core.cache import cache
+from app.core.metrics import MetricsMiddleware, instrument_tortoise, render_metrics
+from app.core.readiness import check_dependencies, warm_up
+from app.core.replicas import ReadYourWritesMiddleware, replicas
+from app.api.routes import auth, dogs, users, files, tasks
+from app.services.external_api import close_http_client
 
 # Create FastAPI instance
 app = FastAPI(
@@ -25,6 +35,14 @@ app.add_middleware(
     allow_headers=settings.allowed_headers,
 )
 
+# Read from the primary right after a client's own writes
+if replicas.aliases:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Request metrics, outermost so they include the other middleware
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Register database
 register_db(app)
 
@@ -33,6 +51,45 @@ app.include_router(auth.router, prefix="/api/auth", tags=["authentication"])
 app.include_router(dogs.router, prefix="/api/dogs", tags=["dogs"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(files.router, prefix="/api", tags=["files"])
+app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
+
+
+@app.on_event("startup")
+async def start_cache_listener():
+    """Listen for cache invalidations published by other processes."""
+    app.state.cache_listener = asyncio.create_task(cache.listen())
+
+
+@app.on_event("startup")
+async def start_warm_up():
+    """Open DB and Redis connections in the background; /ready waits for it."""
+    app.state.ready = asyncio.Event()
+    app.state.warm_up = asyncio.create_task(warm_up(app.state.ready))
+
+
+@app.on_event("startup")
+async def start_db_metrics():
+    """Time database queries once Tortoise is initialized."""
+    instrument_tortoise()
+
+
+@app.on_event("startup")
+async def start_replica_monitor():
+    """Check replica health and lag in the background."""
+    app.state.replica_monitor = None
+    if replicas.aliases:
+        app.state.replica_monitor = asyncio.create_task(replicas.monitor())
+
+
+@app.on_event("shutdown")
+async def shutdown_clients():
+    """Stop background listeners and close pooled HTTP and Redis connections."""
+    app.state.cache_listener.cancel()
+    app.state.warm_up.cancel()
+    if app.state.replica_monitor is not None:
+        app.state.replica_monitor.cancel()
+    await close_http_client()
+    await close_redis()
 
 
 @app.get("/")
@@ -45,12 +102,36 @@ async def root():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics endpoint."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 200 once the database and Redis answer, else 503."""
+    if not app.state.ready.is_set():
+        return JSONResponse(
+            {"status": "starting"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    checks = await check_dependencies()
+    if any(result != "ok" for result in checks.values()):
+        return JSONResponse(
+            {"status": "unavailable", "checks": checks},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    return {"status": "ready", "checks": checks}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,43 @@
+"""Uploaded file models."""
+
+from tortoise import fields
+from tortoise.models import Model
+
+
+class FileBlob(Model):
+    """Content-addressed file contents, stored once per distinct SHA-256."""
+    
+    digest = fields.CharField(max_length=64, pk=True)
+    size = fields.BigIntField()
+    ref_count = fields.IntField(default=0)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    
+    class Meta:
+        """Meta configuration for FileBlob model."""
+        table = "file_blobs"
+    
+    def __str__(self) -> str:
+        """String representation of FileBlob."""
+        return f"{self.digest} ({self.ref_count} refs)"
+
+
+class FileUpload(Model):
+    """A single upload, pointing at the blob holding its contents."""
+    
+    id = fields.CharField(max_length=100, pk=True)
+    blob = fields.ForeignKeyField(
+        "models.FileBlob",
+        related_name="uploads",
+        on_delete=fields.RESTRICT
+    )
+    filename = fields.CharField(max_length=255)
+    content_type = fields.CharField(max_length=255)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    
+    class Meta:
+        """Meta configuration for FileUpload model."""
+        table = "file_uploads"
+    
+    def __str__(self) -> str:
+        """String representation of FileUpload."""
+        return f"{self.id} ({self.filename})"
@@ -1,9 +1,23 @@
 """Dog schemas for request/response validation."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
+from tortoise.models import Model
+
+
+# Response fields mapped to model fields, for queries that select only them
+DOG_RESPONSE_COLUMNS = {
+    "name": "name",
+    "is_adopted": "is_adopted",
+    "id_user": "id_user_id",
+    "id": "id",
+    "picture": "picture",
+    "create_date": "create_date",
+}
+
+MAX_BULK_UPDATE_ITEMS = 1000
 
 
 class DogBase(BaseModel):
@@ -28,6 +42,51 @@ class DogUpdate(BaseModel):
     id_user: Optional[int] = None
 
 
+class DogChanges(BaseModel):
+    """Changes applied by a bulk update; fields left out are not changed."""
+    picture: Optional[str] = None
+    is_adopted: Optional[bool] = None
+    id_user: Optional[int] = None
+
+
+class DogBulkItem(DogChanges):
+    """Changes to one dog, by name."""
+    name: str
+
+
+class DogFilter(BaseModel):
+    """Dogs matched by a bulk update; at least one criterion is required.
+    
+    Filters matching more than ``MAX_BULK_UPDATE_ITEMS`` dogs are rejected.
+    """
+    names: Optional[List[str]] = Field(None, max_length=MAX_BULK_UPDATE_ITEMS)
+    is_adopted: Optional[bool] = None
+    id_user: Optional[int] = None
+    
+    @model_validator(mode="after")
+    def require_criterion(self) -> "DogFilter":
+        if not self.model_fields_set:
+            raise ValueError("filter needs at least one criterion")
+        return self
+
+
+class DogBulkUpdate(BaseModel):
+    """Bulk update: per-dog ``items``, or one set of ``changes`` for a ``filter``."""
+    items: Optional[List[DogBulkItem]] = Field(None, max_length=MAX_BULK_UPDATE_ITEMS)
+    filter: Optional[DogFilter] = None
+    changes: Optional[DogChanges] = None
+    
+    @model_validator(mode="after")
+    def check_mode(self) -> "DogBulkUpdate":
+        if (self.items is None) == (self.filter is None):
+            raise ValueError("give either items or filter")
+        if self.filter is not None and self.changes is None:
+            raise ValueError("filter requires changes")
+        if self.items is not None and self.changes is not None:
+            raise ValueError("changes only apply with filter")
+        return self
+
+
 class DogResponse(DogBase):
     """Dog response schema."""
     id: int
@@ -37,6 +96,35 @@ class DogResponse(DogBase):
     class Config:
         """Pydantic config."""
         from_attributes = True
+    
+    @model_validator(mode="before")
+    @classmethod
+    def read_owner_id(cls, data: Any) -> Any:
+        """Read ``id_user`` from the raw foreign key column of ORM instances."""
+        if not isinstance(data, Model):
+            return data
+        values = {
+            field: getattr(data, field)
+            for field in cls.model_fields
+            if field != "id_user" and hasattr(data, field)
+        }
+        values["id_user"] = data.id_user_id
+        return values
+
+
+class DogSearchResult(DogResponse):
+    """Dog matched by a fuzzy search, with its name similarity."""
+    score: float
+
+
+class DogSearchResults(BaseModel):
+    """Ranked fuzzy search results."""
+    items: List[DogSearchResult]
+
+
+class DogNameSuggestions(BaseModel):
+    """Dog names completing a prefix, in alphabetical order."""
+    items: List[str]
 
 
 class DogWithUser(DogResponse):
@@ -0,0 +1,13 @@
+"""File schemas for request/response validation."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class UploadSessionCreate(BaseModel):
+    """Resumable upload session creation schema."""
+    filename: str = Field(..., min_length=1)
+    size: int = Field(..., ge=0)
+    content_type: Optional[str] = None
+    sha256: Optional[str] = Field(None, pattern="^[0-9a-fA-F]{64}$")
@@ -0,0 +1,13 @@
+"""Pagination schemas shared by list endpoints."""
+
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """A page of results with an opaque cursor to the next page."""
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -6,6 +6,17 @@ from typing import List, Optional
 from pydantic import BaseModel, EmailStr
 
 
+# Response fields mapped to model fields, for queries that select only them
+USER_RESPONSE_COLUMNS = {
+    "name": "name",
+    "last_name": "last_name",
+    "email": "email",
+    "id": "id",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+
 class UserBase(BaseModel):
     """Base user schema."""
     name: str
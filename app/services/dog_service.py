@@ -1,94 +1,570 @@
 """Dog service for business logic."""
 
-from typing import List, Optional
-from tortoise.exceptions import DoesNotExist
+import sqlite3
+import string
+from collections import Counter, defaultdict
+from datetime import datetime
+from difflib import SequenceMatcher
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+from tortoise.exceptions import DoesNotExist, IntegrityError
+from tortoise.transactions import in_transaction
 
+from app.core.cache import cache
+from app.core.pagination import DEFAULT_PAGE_SIZE, paginate
+from app.core.replicas import replica_reads
 from app.models.dog import Dog
 from app.models.user import User
-from app.schemas.dog import DogCreate, DogUpdate, DogResponse
-from app.services.external_api import get_random_dog_image
+from app.schemas.dog import (
+    DOG_RESPONSE_COLUMNS, MAX_BULK_UPDATE_ITEMS, DogBulkUpdate, DogChanges, DogCreate,
+    DogUpdate, DogResponse
+)
+from app.schemas.user import USER_RESPONSE_COLUMNS
+from app.services.image_reservoir import get_dog_image
+
+
+# Dog columns returned by single-statement writes, in DogResponse order
+_RETURNING = ", ".join(f'dogs."{column}"' for column in DOG_RESPONSE_COLUMNS.values())
+
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+_SQLITE_SQLSTATES = {
+    sqlite3.SQLITE_CONSTRAINT_UNIQUE: UNIQUE_VIOLATION,
+    sqlite3.SQLITE_CONSTRAINT_PRIMARYKEY: UNIQUE_VIOLATION,
+    sqlite3.SQLITE_CONSTRAINT_FOREIGNKEY: FOREIGN_KEY_VIOLATION,
+}
+
+_LIKE_ESCAPE = "ESCAPE '\\'"
+
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_MAX_LIMIT = 50
+# Candidates ranked in Python per requested result on SQLite
+SEARCH_SQLITE_CANDIDATES = 5
+# Like pg_trgm's default similarity_threshold
+SEARCH_MIN_SIMILARITY = 0.3
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class DogInclude(str, Enum):
+    """Related data that can be embedded in dog lists."""
+    user = "user"
+
+
+class DogSearchMode(str, Enum):
+    """``fuzzy`` ranks dogs by name similarity; ``prefix`` autocompletes names."""
+    fuzzy = "fuzzy"
+    prefix = "prefix"
+
+
+class UserInclude(str, Enum):
+    """Related data that can be embedded in user lists."""
+    dogs = "dogs"
 
 
 class DogService:
     """Service class for dog operations."""
     
     @staticmethod
-    async def get_all_dogs() -> List[DogResponse]:
-        """Get all dogs."""
-        dogs = await Dog.all().prefetch_related("id_user")
-        return [DogResponse.from_orm(dog) for dog in dogs]
+    @replica_reads
+    async def get_all_dogs(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        is_adopted: Optional[bool] = None,
+        id_user: Optional[int] = None,
+        created_after: Optional[datetime] = None,
+        include: Optional[DogInclude] = None,
+    ) -> Dict[str, Any]:
+        """Get a page of dogs matching the given filters.
+        
+        Only the response columns are selected and rows are returned as plain
+        dicts shaped like ``DogResponse`` (``DogWithUser`` with
+        ``include=user``), ready to be encoded without another validation pass.
+        """
+        queryset = Dog.all()
+        if is_adopted is not None:
+            queryset = queryset.filter(is_adopted=is_adopted)
+        if id_user is not None:
+            queryset = queryset.filter(id_user_id=id_user)
+        if created_after is not None:
+            queryset = queryset.filter(create_date__gt=created_after)
+        
+        dogs, next_cursor = await paginate(
+            queryset, limit, cursor, columns=DOG_RESPONSE_COLUMNS
+        )
+        if include == DogInclude.user:
+            await DogService.attach_users(dogs)
+        return {"items": dogs, "next_cursor": next_cursor}
+    
+    @staticmethod
+    @replica_reads
+    async def attach_users(dogs: List[Dict[str, Any]]) -> None:
+        """Embed each dog's owner as ``user`` with one query for all dogs."""
+        user_ids = {dog["id_user"] for dog in dogs if dog["id_user"] is not None}
+        users = {}
+        if user_ids:
+            rows = await User.filter(id__in=user_ids).values(**USER_RESPONSE_COLUMNS)
+            users = {user["id"]: user for user in rows}
+        for dog in dogs:
+            dog["user"] = users.get(dog["id_user"])
+    
+    @staticmethod
+    @replica_reads
+    async def attach_dogs(users: List[Dict[str, Any]]) -> None:
+        """Embed each user's dogs as ``dogs`` with one query for all users."""
+        dogs_by_user = defaultdict(list)
+        if users:
+            rows = await Dog.filter(
+                id_user_id__in=[user["id"] for user in users]
+            ).order_by("id").values(**DOG_RESPONSE_COLUMNS)
+            for dog in rows:
+                dogs_by_user[dog["id_user"]].append(dog)
+        for user in users:
+            user["dogs"] = dogs_by_user[user["id"]]
     
     @staticmethod
+    @replica_reads(cached=True)
     async def get_dog_by_name(name: str) -> Optional[DogResponse]:
         """Get dog by name."""
-        try:
-            dog = await Dog.get(name=name).prefetch_related("id_user")
-            return DogResponse.from_orm(dog)
-        except DoesNotExist:
-            return None
+        
+        async def _load() -> Optional[Dict[str, Any]]:
+            try:
+                dog = await Dog.get(name=name)
+            except DoesNotExist:
+                return None
+            return DogResponse.from_orm(dog).model_dump(mode="json")
+        
+        dog = await cache.get_or_load("dog", name, _load)
+        return DogResponse(**dog) if dog is not None else None
     
     @staticmethod
-    async def get_adopted_dogs() -> List[DogResponse]:
-        """Get all adopted dogs."""
-        dogs = await Dog.filter(is_adopted=True).prefetch_related("id_user")
-        return [DogResponse.from_orm(dog) for dog in dogs]
+    @replica_reads(cached=True)
+    async def get_adopted_dogs(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        id_user: Optional[int] = None,
+        created_after: Optional[datetime] = None,
+        include: Optional[DogInclude] = None,
+    ) -> Dict[str, Any]:
+        """Get a page of adopted dogs."""
+        include_key = include.value if include else None
+        key = f"{limit}:{cursor}:{id_user}:{created_after}:{include_key}"
+        return await cache.get_or_load(
+            "dogs:adopted",
+            key,
+            lambda: DogService.get_all_dogs(
+                limit=limit,
+                cursor=cursor,
+                is_adopted=True,
+                id_user=id_user,
+                created_after=created_after,
+                include=include
+            )
+        )
+    
+    @staticmethod
+    @replica_reads
+    async def search(
+        q: str,
+        mode: DogSearchMode = DogSearchMode.fuzzy,
+        limit: int = SEARCH_DEFAULT_LIMIT
+    ) -> Dict[str, Any]:
+        """Search dogs by name.
+        
+        ``prefix`` returns only the names starting with ``q`` (ignoring
+        case) in alphabetical order, from a range scan of the
+        ``lower(name)`` index, cheap enough for every keystroke. ``fuzzy``
+        returns full dogs matching ``q`` as a substring or with typos, using
+        the ``pg_trgm`` index: exact matches first, then prefixes, then by
+        trigram similarity.
+        
+        SQLite (development) has neither trigram indexes nor Unicode
+        ``LOWER()``: there both sides are lowercased for ASCII letters only,
+        and fuzzy search scans for names sharing a three-letter substring
+        with ``q``, ranked in Python.
+        """
+        db = Dog._choose_db()
+        postgres = db.capabilities.dialect == "postgres"
+        if mode == DogSearchMode.prefix:
+            return {"items": await _search_prefix(db, postgres, q, limit)}
+        
+        if postgres:
+            rows = await db.execute_query_dict(
+                f'SELECT {_RETURNING}, similarity(dogs."name", $1) AS "score" FROM dogs '
+                f'WHERE dogs."name" % $1 OR dogs."name" ILIKE $2 {_LIKE_ESCAPE} '
+                f'ORDER BY LOWER(dogs."name") = LOWER($1) DESC, '
+                f'STARTS_WITH(LOWER(dogs."name"), LOWER($1)) DESC, "score" DESC, dogs."name" '
+                f"LIMIT $3",
+                [q, f"%{_escape_like(q)}%", limit]
+            )
+        else:
+            rows = await _search_fuzzy_sqlite(db, q, limit)
+        
+        return {
+            "items": [
+                {**_dog_response(row).model_dump(), "score": round(float(row["score"]), 4)}
+                for row in rows
+            ]
+        }
+    
+    @staticmethod
+    async def invalidate_cache(
+        names: Iterable[str] = (),
+        user_ids: Iterable[Optional[int]] = (),
+        adopted: bool = True
+    ) -> None:
+        """Drop cached reads affected by a write to the given dogs."""
+        await cache.invalidate("dog", *names)
+        await cache.invalidate("user", *user_ids)
+        if adopted:
+            await cache.invalidate_namespace("dogs:adopted")
     
     @staticmethod
     async def create_dog_sync(dog_data: DogCreate) -> DogResponse:
         """Create dog synchronously (for testing purposes)."""
-        # Validate user exists if id_user is provided
-        if dog_data.id_user:
-            try:
-                await User.get(id=dog_data.id_user)
-            except DoesNotExist:
-                raise ValueError(f"User with id {dog_data.id_user} does not exist")
-        
-        # Get random dog picture
-        picture_url = await get_random_dog_image()
-        if picture_url is None:
-            picture_url = "https://images.dog.ceo/breeds/hound-afghan/n02088094_1007.jpg"
-        
-        # Create dog
-        dog = await Dog.create(
-            name=dog_data.name,
-            picture=picture_url,
-            is_adopted=dog_data.is_adopted,
-            id_user_id=dog_data.id_user if dog_data.id_user else None
+        # Get random dog picture from the prefetched reservoir
+        picture_url = await get_dog_image()
+        
+        # Create dog; the name and owner are checked by the constraints
+        try:
+            dog = await Dog.create(
+                name=dog_data.name,
+                picture=picture_url,
+                is_adopted=dog_data.is_adopted,
+                id_user_id=dog_data.id_user if dog_data.id_user else None
+            )
+        except IntegrityError as e:
+            raise constraint_error(e, dog_data.name, dog_data.id_user)
+        await DogService.invalidate_cache(
+            [dog.name], [dog.id_user_id], adopted=dog.is_adopted
         )
         
         return DogResponse.from_orm(dog)
     
     @staticmethod
     async def update_dog(name: str, dog_data: DogUpdate) -> Optional[DogResponse]:
-        """Update dog by name."""
+        """Update dog by name with a single ``UPDATE ... RETURNING``.
+        
+        Taken names and missing users are reported by the unique and foreign
+        key constraints and raised as ``ValueError``.
+        """
+        changes = dog_data.dict(exclude_unset=True)
+        if "id_user" in changes:
+            changes["id_user_id"] = changes.pop("id_user")
+        if not changes:
+            dog = await Dog.filter(name=name).first().values(**DOG_RESPONSE_COLUMNS)
+            return DogResponse(**dog) if dog else None
+        
         try:
-            dog = await Dog.get(name=name)
-            
-            # Validate user exists if id_user is provided
-            if dog_data.id_user:
-                try:
-                    await User.get(id=dog_data.id_user)
-                except DoesNotExist:
-                    raise ValueError(f"User with id {dog_data.id_user} does not exist")
-            
-            # Update fields
-            update_data = dog_data.dict(exclude_unset=True)
-            if "id_user" in update_data:
-                update_data["id_user_id"] = update_data.pop("id_user")
-            
-            await dog.update_from_dict(update_data)
-            await dog.save()
-            
-            return DogResponse.from_orm(dog)
-        except DoesNotExist:
+            row = await _update_returning(name, changes)
+        except IntegrityError as e:
+            raise constraint_error(e, changes.get("name", name), changes.get("id_user_id"))
+        if row is None:
             return None
+        
+        dog = _dog_response(row)
+        await DogService.invalidate_cache(
+            {name, dog.name}, {row["previous_user_id"], dog.id_user}
+        )
+        return dog
     
     @staticmethod
-    async def delete_dog(name: str) -> bool:
-        """Delete dog by name."""
+    async def bulk_update(update: DogBulkUpdate) -> Dict[str, Any]:
+        """Apply a bulk update with set-based UPDATEs in one transaction.
+        
+        Referenced users are checked with one query. Items sharing the same
+        changes are updated together, so a batch of adoptions by one user is
+        a single UPDATE. Returns one result per dog.
+        
+        Raises ``ValueError`` if the ``changes`` of a filter update reference
+        a missing user or the filter matches more than
+        ``MAX_BULK_UPDATE_ITEMS`` dogs; with ``items`` only the affected
+        items fail.
+        """
+        items = update.items
+        if items is None:
+            items = [update.changes]
+        changes = [_model_changes(item) for item in items]
+        
+        user_ids = {c["id_user_id"] for c in changes if c.get("id_user_id") is not None}
+        existing_users = set()
+        if user_ids:
+            existing_users = set(
+                await User.filter(id__in=user_ids).values_list("id", flat=True)
+            )
+        
+        if update.filter is not None:
+            return await DogService._update_matching(update, changes[0], existing_users)
+        
+        results: List[Dict[str, Any]] = []
+        groups = defaultdict(list)
+        seen = set()
+        for item, item_changes in zip(update.items, changes):
+            user_id = item_changes.get("id_user_id")
+            result = {"name": item.name}
+            results.append(result)
+            if item.name in seen:
+                result.update(status="failed", error="Duplicate name in request")
+            elif user_id is not None and user_id not in existing_users:
+                result.update(status="failed", error=f"User with id {user_id} does not exist")
+            else:
+                groups[tuple(sorted(item_changes.items()))].append(result)
+            seen.add(item.name)
+        
+        try:
+            previous_owners = await DogService._update_groups(groups)
+        except IntegrityError:
+            # A user was deleted after the check; apply each group on its own
+            # so only the items assigned to that user fail
+            previous_owners = {}
+            for group_changes, group in groups.items():
+                try:
+                    previous_owners.update(
+                        await DogService._update_groups({group_changes: group})
+                    )
+                except IntegrityError as e:
+                    error = constraint_error(
+                        e, group[0]["name"], dict(group_changes).get("id_user_id")
+                    )
+                    if not isinstance(error, ValueError):
+                        raise error
+                    for result in group:
+                        result.update(status="failed", error=str(error))
+        
+        for group_changes, group in groups.items():
+            for result in group:
+                if "status" in result:
+                    continue
+                if result["name"] not in previous_owners:
+                    result["status"] = "not_found"
+                else:
+                    result["status"] = "updated" if group_changes else "unchanged"
+        
+        await DogService.invalidate_cache(
+            previous_owners,
+            set(previous_owners.values()) | {c.get("id_user_id") for c in changes}
+        )
+        return _bulk_results(results)
+    
+    @staticmethod
+    async def _update_groups(groups: Dict[tuple, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Apply grouped item changes in one transaction; returns previous owners."""
+        async with in_transaction():
+            dogs = await Dog.filter(
+                name__in=[result["name"] for group in groups.values() for result in group]
+            ).values("name", "id_user_id")
+            previous_owners = {dog["name"]: dog["id_user_id"] for dog in dogs}
+            for group_changes, group in groups.items():
+                names = [result["name"] for result in group if result["name"] in previous_owners]
+                if names and group_changes:
+                    await Dog.filter(name__in=names).update(**dict(group_changes))
+        return previous_owners
+    
+    @staticmethod
+    async def _update_matching(
+        update: DogBulkUpdate, changes: Dict[str, Any], existing_users: set
+    ) -> Dict[str, Any]:
+        user_id = changes.get("id_user_id")
+        if user_id is not None and user_id not in existing_users:
+            raise ValueError(f"User with id {user_id} does not exist")
+        
+        criteria = update.filter.model_dump(exclude_unset=True)
+        if "names" in criteria:
+            criteria["name__in"] = criteria.pop("names")
+        if "id_user" in criteria:
+            criteria["id_user_id"] = criteria.pop("id_user")
+        
         try:
-            dog = await Dog.get(name=name)
-            await dog.delete()
-            return True
-        except DoesNotExist:
-            return False
\ No newline at end of file
+            async with in_transaction():
+                # Lock at most one row past the limit: the UPDATE binds every id
+                # and the response lists every dog, so larger matches are refused
+                dogs = await Dog.filter(**criteria).order_by("id").limit(
+                    MAX_BULK_UPDATE_ITEMS + 1
+                ).select_for_update().values("id", "name", "id_user_id")
+                if len(dogs) > MAX_BULK_UPDATE_ITEMS:
+                    raise ValueError(
+                        f"filter matches more than {MAX_BULK_UPDATE_ITEMS} dogs; narrow it "
+                        "or send items"
+                    )
+                if dogs and changes:
+                    await Dog.filter(id__in=[dog["id"] for dog in dogs]).update(**changes)
+        except IntegrityError as e:
+            raise constraint_error(e, dogs[0]["name"], user_id)
+        
+        status = "updated" if changes else "unchanged"
+        results = [{"name": dog["name"], "status": status} for dog in dogs]
+        matched = {dog["name"] for dog in dogs}
+        results.extend(
+            {"name": name, "status": "not_found"}
+            for name in dict.fromkeys(criteria.get("name__in", ()))
+            if name not in matched
+        )
+        
+        await DogService.invalidate_cache(
+            [dog["name"] for dog in dogs],
+            {dog["id_user_id"] for dog in dogs} | {user_id}
+        )
+        return _bulk_results(results)
+    
+    @staticmethod
+    async def delete_dog(name: str) -> bool:
+        """Delete dog by name with a single ``DELETE ... RETURNING``."""
+        db = Dog._choose_db(for_write=True)
+        rows = await db.execute_query_dict(
+            f'DELETE FROM dogs WHERE "name" = {_placeholders(db, 1)[0]} RETURNING "id_user_id"',
+            [name]
+        )
+        if not rows:
+            return False
+        await DogService.invalidate_cache([name], [rows[0]["id_user_id"]])
+        return True
+
+
+def constraint_error(
+    error: IntegrityError, name: str, id_user: Optional[int] = None
+) -> Exception:
+    """Map a violated constraint of a dog insert or update to a ``ValueError``.
+    
+    The constraint is identified by SQLSTATE (asyncpg) or extended error code
+    (SQLite), not by message text. Other violations, such as NOT NULL, are
+    bugs rather than bad input, so ``error`` itself is returned to be
+    re-raised.
+    """
+    original = error.args[0] if error.args else None
+    code = getattr(original, "sqlstate", None) or _SQLITE_SQLSTATES.get(
+        getattr(original, "sqlite_errorcode", None)
+    )
+    if code == UNIQUE_VIOLATION:
+        return ValueError(f"Dog with name '{name}' already exists")
+    if code == FOREIGN_KEY_VIOLATION:
+        return ValueError(f"User with id {id_user} does not exist")
+    return error
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with ``prefix``."""
+    prefix = prefix.rstrip(chr(0x10FFFF))
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _ascii_lower(value: str) -> str:
+    """Lowercase like SQLite's ``LOWER()``, which leaves non-ASCII letters alone."""
+    return value.translate(_ASCII_LOWER)
+
+
+async def _search_prefix(db, postgres: bool, q: str, limit: int) -> List[str]:
+    """Names starting with ``q``, case-insensitively, by index range scan."""
+    # Byte order, matching the COLLATE "C" index on Postgres and SQLite's BINARY
+    key = 'LOWER("name") COLLATE "C"' if postgres else 'LOWER("name")'
+    lower = q.lower() if postgres else _ascii_lower(q)
+    upper = _prefix_upper_bound(lower)
+    conditions = [f"{key} >= {{}}"]
+    values: List[Any] = [lower]
+    if upper is not None:
+        conditions.append(f"{key} < {{}}")
+        values.append(upper)
+    values.append(limit)
+    params = _placeholders(db, len(values))
+    where = " AND ".join(
+        condition.format(param) for condition, param in zip(conditions, params)
+    )
+    rows = await db.execute_query_dict(
+        f'SELECT "name" FROM dogs WHERE {where} ORDER BY {key} LIMIT {params[-1]}',
+        values
+    )
+    return [row["name"] for row in rows]
+
+
+async def _search_fuzzy_sqlite(db, q: str, limit: int) -> List[Dict[str, Any]]:
+    """Fuzzy search without trigram support, for SQLite.
+    
+    Candidates contain ``q`` or one of its three-letter substrings (SQLite's
+    LIKE ignores ASCII case); they are scored with difflib and kept when at
+    least ``SEARCH_MIN_SIMILARITY`` similar or containing ``q``.
+    """
+    needle = _ascii_lower(q)
+    fragments = {needle} | {needle[i:i + 3] for i in range(len(needle) - 2)}
+    like = f'dogs."name" LIKE ? {_LIKE_ESCAPE}'
+    rows = await db.execute_query_dict(
+        f"SELECT {_RETURNING} FROM dogs WHERE "
+        + " OR ".join([like] * len(fragments))
+        # Names containing all of q are kept over partial matches
+        + f" ORDER BY {like} DESC LIMIT ?",
+        [f"%{_escape_like(fragment)}%" for fragment in [*fragments, needle]]
+        + [limit * SEARCH_SQLITE_CANDIDATES]
+    )
+    
+    matches = []
+    for row in rows:
+        name = _ascii_lower(row["name"])
+        row["score"] = SequenceMatcher(None, needle, name).ratio()
+        if needle in name or row["score"] >= SEARCH_MIN_SIMILARITY:
+            matches.append((name != needle, not name.startswith(needle), -row["score"], row))
+    matches.sort(key=lambda match: (*match[:3], match[3]["name"]))
+    return [match[3] for match in matches[:limit]]
+
+
+def _placeholders(db, count: int) -> List[str]:
+    if db.capabilities.dialect == "postgres":
+        return [f"${i}" for i in range(1, count + 1)]
+    return ["?"] * count
+
+
+def _dog_response(row: Dict[str, Any]) -> DogResponse:
+    return DogResponse(
+        **{field: row[column] for field, column in DOG_RESPONSE_COLUMNS.items()}
+    )
+
+
+async def _update_returning(name: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Update one dog by name, returning its new row and ``previous_user_id``."""
+    db = Dog._choose_db(for_write=True)
+    values = [*changes.values(), name]
+    params = _placeholders(db, len(values))
+    assignments = ", ".join(
+        f'"{column}" = {param}' for column, param in zip(changes, params)
+    )
+    
+    if db.capabilities.dialect == "postgres":
+        # Lock the row and read its previous owner in the same statement
+        rows = await db.execute_query_dict(
+            f"UPDATE dogs SET {assignments} "
+            f'FROM (SELECT "id", "id_user_id" FROM dogs WHERE "name" = {params[-1]} '
+            f"FOR UPDATE) AS previous "
+            f'WHERE dogs."id" = previous."id" '
+            f'RETURNING {_RETURNING}, previous."id_user_id" AS "previous_user_id"',
+            values
+        )
+        return rows[0] if rows else None
+    
+    # SQLite can't return the old value; read it only when the owner changes
+    previous = None
+    if "id_user_id" in changes:
+        previous = await Dog.filter(name=name).first().values("id_user_id")
+    rows = await db.execute_query_dict(
+        f'UPDATE dogs SET {assignments} WHERE "name" = {params[-1]} RETURNING {_RETURNING}',
+        values
+    )
+    if not rows:
+        return None
+    row = dict(rows[0])
+    row["previous_user_id"] = (previous or row)["id_user_id"]
+    return row
+
+
+def _model_changes(changes: DogChanges) -> Dict[str, Any]:
+    """Model field values of the fields set in ``changes``."""
+    values = changes.model_dump(exclude_unset=True, exclude={"name"})
+    if "id_user" in values:
+        values["id_user_id"] = values.pop("id_user")
+    return values
+
+
+def _bulk_results(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-item results with the number of items in each status."""
+    return {"counts": dict(Counter(item["status"] for item in items)), "items": items}
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""Export service for streaming whole tables as NDJSON or CSV."""
+
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List
+
+from tortoise.queryset import QuerySet
+
+from app.config.settings import settings
+from app.schemas.dog import DOG_RESPONSE_COLUMNS
+from app.schemas.user import USER_RESPONSE_COLUMNS
+
+# Exports lead with the id so that resuming with after_id is straightforward
+DOG_EXPORT_COLUMNS = {"id": "id", **DOG_RESPONSE_COLUMNS}
+USER_EXPORT_COLUMNS = {"id": "id", **USER_RESPONSE_COLUMNS}
+
+
+class ExportFormat(str, Enum):
+    """Supported export formats."""
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def _serialize_value(value: Any) -> Any:
+    """Convert values that the json and csv modules cannot handle."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def iter_chunks(
+    queryset: QuerySet,
+    columns: Dict[str, str],
+    after_id: int = 0,
+    chunk_size: int = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield rows of ``queryset`` in primary key order, one chunk at a time.
+
+    Each chunk is a separate keyset query (``id > last_id``), so no server-side
+    cursor or transaction is held open between chunks and memory is bounded by
+    ``chunk_size`` regardless of the table size.
+    """
+    chunk_size = chunk_size or settings.export_chunk_size
+    last_id = after_id
+    while True:
+        rows = await (
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .limit(chunk_size)
+            .values(**columns)
+        )
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+async def stream_export(
+    queryset: QuerySet,
+    columns: Dict[str, str],
+    export_format: ExportFormat,
+    after_id: int = 0,
+) -> AsyncIterator[bytes]:
+    """Encode the rows of ``queryset`` as NDJSON lines or CSV records."""
+    if export_format == ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(columns))
+        writer.writeheader()
+        yield buffer.getvalue().encode()
+        
+        async for rows in iter_chunks(queryset, columns, after_id):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                {key: _serialize_value(value) for key, value in row.items()}
+                for row in rows
+            )
+            yield buffer.getvalue().encode()
+        return
+    
+    async for rows in iter_chunks(queryset, columns, after_id):
+        yield "".join(
+            json.dumps(row, default=_serialize_value) + "\n" for row in rows
+        ).encode()
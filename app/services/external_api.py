@@ -1,22 +1,88 @@
 """External API service for fetching dog images."""
 
+import time
 import httpx
-from typing import Optional
+from typing import Any, List, Optional
 
 from app.config.settings import settings
+from app.core.metrics import observe_dog_ceo_call
+
+DEFAULT_DOG_PICTURE = "https://images.dog.ceo/breeds/hound-afghan/n02088094_1007.jpg"
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print("HTTP/2 requested for dog.ceo but 'h2' is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide client with pooled keep-alive connections."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.dog_ceo_read_timeout,
+                connect=settings.dog_ceo_connect_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.dog_ceo_max_connections,
+                max_keepalive_connections=settings.dog_ceo_max_keepalive_connections
+            ),
+            http2=settings.dog_ceo_http2 and _http2_available()
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _get_message(url: str) -> Any:
+    """GET a dog.ceo endpoint and return its ``message``.
+    
+    Returns None when dog.ceo reports a failure; network and HTTP errors
+    propagate. Every call is timed and recorded with its outcome.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        response = await get_http_client().get(url)
+        response.raise_for_status()
+        data = response.json()
+        
+        if data.get("status") != "success":
+            return None
+        outcome = "success"
+        return data.get("message")
+    finally:
+        observe_dog_ceo_call(outcome, time.perf_counter() - start)
 
 
 async def get_random_dog_image() -> Optional[str]:
     """Fetch a random dog image from dog.ceo API."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(settings.dog_ceo_api_url)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get("status") == "success":
-                return data.get("message")
-            return None
+        return await _get_message(settings.dog_ceo_api_url)
     except Exception as e:
         print(f"Error fetching dog image: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+async def get_random_dog_images(count: int) -> List[str]:
+    """Fetch up to ``count`` random dog images from dog.ceo in one call."""
+    try:
+        message = await _get_message(f"{settings.dog_ceo_api_url.rstrip('/')}/{count}")
+        return list(message or [])
+    except Exception as e:
+        print(f"Error fetching dog images: {e}")
+        return []
@@ -0,0 +1,283 @@
+"""Content-addressed file storage for uploads.
+
+File contents are stored once under their SHA-256 digest in a sharded layout
+(``objects/ab/cd/abcd...``) and tracked by a ``FileBlob`` row with a reference
+count. Every upload gets its own ``FileUpload`` row and stable id pointing at
+the blob, so re-uploading the same bytes only adds a reference.
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+try:
+    from python_multipart.exceptions import FormParserError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:
+    # python-multipart before 0.0.13 ships the module as ``multipart``
+    from multipart.exceptions import FormParserError
+    from multipart.multipart import MultipartParser, parse_options_header
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+
+from app.config.settings import settings
+from app.models.file import FileBlob, FileUpload
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured maximum size."""
+
+
+class ChecksumMismatchError(ValueError):
+    """Raised when uploaded bytes do not match the digest the client announced."""
+
+
+class InvalidUploadError(ValueError):
+    """Raised when a request body is not a multipart form with a file part."""
+
+
+def blob_path(digest: str) -> str:
+    """Get the sharded path of the blob with the given SHA-256 digest."""
+    return os.path.join(settings.upload_dir, "objects", digest[:2], digest[2:4], digest)
+
+
+def temp_path() -> str:
+    """Get a fresh path for an upload that is still being written."""
+    return os.path.join(settings.upload_dir, "tmp", f"{uuid.uuid4()}.part")
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _place_blob(source: str, digest: str) -> None:
+    target = blob_path(digest)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(source, target)
+
+
+class _MultipartFile:
+    """Pull the data of one file field out of a multipart body as it arrives.
+    
+    Parts other than the first file part named ``field`` are skipped; its
+    filename and content type are set once its headers have been parsed.
+    """
+    
+    def __init__(self, content_type: str, field: str):
+        media_type, params = parse_options_header(content_type)
+        if media_type != b"multipart/form-data" or not params.get(b"boundary"):
+            raise InvalidUploadError("Expected a multipart/form-data body")
+        self.field = field
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self._headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._in_file = False
+        self._chunks: List[bytes] = []
+        self._parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+    
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+    
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+    
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+    
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = self._header_value = b""
+    
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition"))
+        filename = options.get(b"filename")
+        if self.filename is None and filename \
+                and options.get(b"name") == self.field.encode():
+            self.filename = filename.decode("utf-8", "replace")
+            content_type = self._headers.get(b"content-type")
+            self.content_type = content_type.decode("latin-1") if content_type else None
+            self._in_file = True
+    
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._chunks.append(data[start:end])
+    
+    def _on_part_end(self) -> None:
+        self._in_file = False
+    
+    async def read(self, stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Yield the file part's data while feeding ``stream`` to the parser."""
+        try:
+            async for data in stream:
+                self._parser.write(data)
+                chunks, self._chunks = self._chunks, []
+                for chunk in chunks:
+                    yield chunk
+            self._parser.finalize()
+        except FormParserError as e:
+            raise InvalidUploadError(f"Malformed multipart body: {e}")
+
+
+async def _stream_to_disk(chunks: AsyncIterator[bytes], path: Optional[str]) -> Dict[str, Any]:
+    """Hash, size-check and write chunks straight from the network.
+    
+    Data is buffered up to ``upload_chunk_size`` between writes, which run in
+    a worker thread so the event loop is never blocked. With ``path=None``
+    the data is only hashed.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    buffer = bytearray()
+    output = None
+    if path is not None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        output = await asyncio.to_thread(open, path, "wb")
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > settings.max_upload_size:
+                raise UploadTooLargeError(
+                    f"File exceeds maximum size of {settings.max_upload_size} bytes"
+                )
+            digest.update(chunk)
+            if output is not None:
+                buffer += chunk
+                if len(buffer) >= settings.upload_chunk_size:
+                    await asyncio.to_thread(output.write, bytes(buffer))
+                    buffer.clear()
+        if output is not None and buffer:
+            await asyncio.to_thread(output.write, bytes(buffer))
+    except BaseException:
+        if output is not None:
+            await asyncio.to_thread(output.close)
+            await asyncio.to_thread(_remove, path)
+        raise
+    if output is not None:
+        await asyncio.to_thread(output.close)
+    return {"size": size, "sha256": digest.hexdigest()}
+
+
+class BlobNotStoredError(LookupError):
+    """Raised when a blob expected to be stored no longer exists."""
+
+
+async def add_blob_reference(source: Optional[str], digest: str, size: int) -> bool:
+    """Reference the blob ``digest``, storing ``source`` if it is new.
+    
+    Returns True when the blob already existed, in which case ``source`` is
+    discarded instead of being written again. The reference is taken under
+    the blob's row lock, the same lock ``delete_upload`` holds while removing
+    an orphaned blob file, so a blob is never removed from under a new
+    reference.
+    """
+    while True:
+        async with in_transaction():
+            blob = await FileBlob.filter(digest=digest).select_for_update().first()
+            if blob is not None:
+                await FileBlob.filter(digest=digest).update(ref_count=F("ref_count") + 1)
+        if blob is not None:
+            if source is not None:
+                await asyncio.to_thread(_remove, source)
+            return True
+        
+        if source is None:
+            raise BlobNotStoredError(f"Blob {digest} is not stored")
+        await asyncio.to_thread(_place_blob, source, digest)
+        try:
+            await FileBlob.create(digest=digest, size=size, ref_count=1)
+        except IntegrityError:
+            # Another upload of the same content created the row first and
+            # its file replaced ours; reference it on the next pass
+            source = None
+            continue
+        return False
+
+
+async def _drop_blob_reference(digest: str) -> None:
+    # Must run inside a transaction; the blob file is removed while its row
+    # is still locked, so a concurrent upload of the same content waits and
+    # then stores it anew
+    blob = await FileBlob.filter(digest=digest).select_for_update().first()
+    if blob.ref_count > 1:
+        await FileBlob.filter(digest=digest).update(ref_count=F("ref_count") - 1)
+    else:
+        await blob.delete()
+        await asyncio.to_thread(_remove, blob_path(digest))
+
+
+async def save_upload(
+    stream: AsyncIterator[bytes], content_type: str, expected_digest: Optional[str] = None
+) -> Dict[str, Any]:
+    """Store the ``file`` part of a multipart body and return its stable id.
+    
+    The body is parsed as it arrives and the file data goes straight to a
+    temporary blob, so it is written to disk once. When the client announces
+    the SHA-256 of a blob that is already stored, a reference is taken up
+    front and the body is only hashed to verify it.
+    """
+    upload = _MultipartFile(content_type, "file")
+    known = False
+    if expected_digest is not None:
+        try:
+            known = await add_blob_reference(None, expected_digest, 0)
+        except BlobNotStoredError:
+            pass
+    path = None if known else temp_path()
+    
+    try:
+        stored = await _stream_to_disk(upload.read(stream), path)
+        if upload.filename is None:
+            raise InvalidUploadError("No file provided")
+        if expected_digest is not None and stored["sha256"] != expected_digest:
+            raise ChecksumMismatchError("Uploaded content does not match the given SHA-256")
+    except BaseException:
+        if known:
+            async with in_transaction():
+                await _drop_blob_reference(expected_digest)
+        elif path is not None:
+            await asyncio.to_thread(_remove, path)
+        raise
+    
+    deduplicated = known or await add_blob_reference(path, stored["sha256"], stored["size"])
+    record = await FileUpload.create(
+        id=f"{uuid.uuid4()}{os.path.splitext(upload.filename)[1]}",
+        blob_id=stored["sha256"],
+        filename=upload.filename,
+        content_type=upload.content_type or "unknown"
+    )
+    
+    return {
+        "saved_as": record.id,
+        "filename": record.filename,
+        "content_type": record.content_type,
+        "size": stored["size"],
+        "sha256": stored["sha256"],
+        "deduplicated": deduplicated,
+    }
+
+
+async def delete_upload(upload_id: str) -> bool:
+    """Delete an upload, removing the blob once nothing references it."""
+    async with in_transaction():
+        upload = await FileUpload.filter(id=upload_id).select_for_update().first()
+        if upload is None:
+            return False
+        await upload.delete()
+        await _drop_blob_reference(upload.blob_id)
+    return True
\ No newline at end of file
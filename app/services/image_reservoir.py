@@ -0,0 +1,146 @@
+"""Redis-backed reservoir of prefetched dog image URLs.
+
+A background refiller keeps a Redis list topped up with URLs fetched from
+dog.ceo in batches, so dog creation pops a picture in O(1) instead of waiting
+on a live request. A live call, then ``DEFAULT_DOG_PICTURE``, are only used
+when the reservoir is empty or Redis is unavailable.
+
+Depth, hits and misses, and refills are exported as Prometheus metrics for
+alerting; ``reservoir_stats`` reads the same figures from Redis for the
+``/api/reservoir`` JSON view.
+"""
+
+import time
+import uuid
+from typing import Dict, List
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, WatchError
+
+from app.config.redis import get_redis
+from app.config.settings import settings
+from app.core.metrics import observe_reservoir_depth, observe_reservoir_pop
+from app.services.external_api import (
+    DEFAULT_DOG_PICTURE, get_random_dog_image, get_random_dog_images
+)
+
+RESERVOIR_KEY = "dogs:images:reservoir"
+REFILL_LOCK_KEY = "dogs:images:reservoir:lock"
+REFILLED_TOTAL_KEY = "dogs:images:reservoir:refilled"
+REFILLED_MINUTE_KEY = "dogs:images:reservoir:refilled:{minute}"
+POPPED_TOTAL_KEY = "dogs:images:reservoir:popped"
+MISSED_TOTAL_KEY = "dogs:images:reservoir:missed"
+
+# dog.ceo returns at most 50 images per request
+MAX_BATCH_SIZE = 50
+RATE_WINDOW_MINUTES = 5
+
+
+async def pop_images(count: int) -> List[str]:
+    """Pop up to ``count`` image URLs from the reservoir."""
+    redis = get_redis()
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.lpop(RESERVOIR_KEY, count)
+            pipe.llen(RESERVOIR_KEY)
+            images, depth = await pipe.execute()
+        images = images or []
+        observe_reservoir_depth(depth)
+        async with redis.pipeline(transaction=False) as pipe:
+            if images:
+                pipe.incrby(POPPED_TOTAL_KEY, len(images))
+            if len(images) < count:
+                pipe.incrby(MISSED_TOTAL_KEY, count - len(images))
+            await pipe.execute()
+    except RedisError as e:
+        print(f"Error reading image reservoir: {e}")
+        images = []
+    observe_reservoir_pop(len(images), count - len(images))
+    return images
+
+
+async def get_dog_image() -> str:
+    """Get a dog image from the reservoir, falling back to a live call."""
+    images = await pop_images(1)
+    if images:
+        return images[0]
+    return await get_random_dog_image() or DEFAULT_DOG_PICTURE
+
+
+async def _release_lock(redis: Redis, token: str) -> None:
+    # Only delete the lock if it is still ours; it may have expired and been
+    # taken by another refiller while this one was fetching
+    async with redis.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(REFILL_LOCK_KEY)
+            if await pipe.get(REFILL_LOCK_KEY) != token:
+                return
+            pipe.multi()
+            pipe.delete(REFILL_LOCK_KEY)
+            await pipe.execute()
+        except WatchError:
+            pass
+
+
+async def refill_reservoir() -> int:
+    """Top the reservoir up to ``image_reservoir_size`` URLs.
+    
+    A short Redis lock keeps concurrent refillers from overshooting. Returns
+    the number of URLs added.
+    """
+    redis = get_redis()
+    lock_timeout = max(1, int(settings.image_reservoir_refill_interval))
+    token = uuid.uuid4().hex
+    if not await redis.set(REFILL_LOCK_KEY, token, nx=True, ex=lock_timeout):
+        return 0
+    
+    added = 0
+    try:
+        depth = await redis.llen(RESERVOIR_KEY)
+        observe_reservoir_depth(depth)
+        missing = settings.image_reservoir_size - depth
+        while missing > 0:
+            images = await get_random_dog_images(min(MAX_BATCH_SIZE, missing))
+            if not images:
+                break
+            depth = await redis.rpush(RESERVOIR_KEY, *images)
+            added += len(images)
+            missing -= len(images)
+            observe_reservoir_depth(depth, refilled=len(images))
+    finally:
+        await _release_lock(redis, token)
+    
+    if added:
+        minute_key = REFILLED_MINUTE_KEY.format(minute=int(time.time() // 60))
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.incrby(REFILLED_TOTAL_KEY, added)
+            pipe.incrby(minute_key, added)
+            pipe.expire(minute_key, (RATE_WINDOW_MINUTES + 1) * 60)
+            await pipe.execute()
+    return added
+
+
+async def reservoir_stats() -> Dict[str, float]:
+    """Get reservoir depth and refill/consumption counters."""
+    redis = get_redis()
+    current_minute = int(time.time() // 60)
+    minute_keys = [
+        REFILLED_MINUTE_KEY.format(minute=current_minute - offset)
+        for offset in range(RATE_WINDOW_MINUTES)
+    ]
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.llen(RESERVOIR_KEY)
+        pipe.get(REFILLED_TOTAL_KEY)
+        pipe.get(POPPED_TOTAL_KEY)
+        pipe.get(MISSED_TOTAL_KEY)
+        pipe.mget(minute_keys)
+        depth, refilled, popped, missed, recent = await pipe.execute()
+    
+    return {
+        "depth": depth,
+        "capacity": settings.image_reservoir_size,
+        "refilled_total": int(refilled or 0),
+        "popped_total": int(popped or 0),
+        "missed_total": int(missed or 0),
+        "refill_rate_per_minute": sum(int(v or 0) for v in recent) / RATE_WINDOW_MINUTES,
+    }
@@ -0,0 +1,73 @@
+"""Task state events published over Redis.
+
+Tasks publish their state changes (queued, started, succeeded, failed) on a
+per-task pub/sub channel and keep the latest event in a key, so clients can
+look up the current state in O(1) or subscribe to changes instead of polling.
+"""
+
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from redis.exceptions import RedisError
+
+from app.config.redis import get_redis
+
+TASK_STATE_KEY = "tasks:{task_id}:state"
+TASK_CHANNEL = "tasks:{task_id}:events"
+TERMINAL_STATES = {"succeeded", "failed"}
+
+# Keep states as long as Celery keeps results
+STATE_TTL = 3600
+
+
+async def publish_task_event(task_id: str, state: str, **data: Any) -> None:
+    """Record and broadcast a state change of a task."""
+    event = {"task_id": task_id, "state": state, "timestamp": time.time(), **data}
+    payload = json.dumps(event)
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.set(TASK_STATE_KEY.format(task_id=task_id), payload, ex=STATE_TTL)
+            pipe.publish(TASK_CHANNEL.format(task_id=task_id), payload)
+            await pipe.execute()
+    except RedisError as e:
+        print(f"Error publishing task event: {e}")
+
+
+async def get_task_state(task_id: str) -> Optional[Dict[str, Any]]:
+    """Get the latest event of a task."""
+    payload = await get_redis().get(TASK_STATE_KEY.format(task_id=task_id))
+    return json.loads(payload) if payload else None
+
+
+async def stream_task_events(
+    task_id: str, keepalive: float = 15.0
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """Yield the current state of a task and then every change until it ends.
+    
+    The channel is subscribed before the stored state is read so no change
+    can slip in between. ``None`` is yielded every ``keepalive`` seconds
+    without events so callers can keep idle connections open.
+    """
+    pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(TASK_CHANNEL.format(task_id=task_id))
+    try:
+        event = await get_task_state(task_id)
+        if event is not None:
+            yield event
+            if event["state"] in TERMINAL_STATES:
+                return
+        
+        while True:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=keepalive
+            )
+            if message is None:
+                yield None
+                continue
+            event = json.loads(message["data"])
+            yield event
+            if event["state"] in TERMINAL_STATES:
+                return
+    finally:
+        await pubsub.aclose()
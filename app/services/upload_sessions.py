@@ -0,0 +1,340 @@
+"""Resumable chunked uploads.
+
+A session preallocates one data file under ``uploads/sessions/<id>/`` and
+every numbered chunk is written straight to its offset in that file, so chunks
+can arrive in any order or in parallel. A marker file per received chunk and a
+``session.json`` descriptor make the state recoverable after a restart.
+Finalizing hashes the data file and moves it into the content-addressed store
+without copying it again.
+
+Chunk writers register under ``writers/`` before checking for the
+``completing`` marker that finalizing creates exclusively, and finalizing
+only proceeds once no writer is registered, so no write can land in a data
+file that is being hashed and no session is finalized twice.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.config.settings import settings
+from app.models.file import FileUpload
+from app.services.file_storage import (
+    ChecksumMismatchError, UploadTooLargeError, add_blob_reference
+)
+
+
+class SessionBusyError(ValueError):
+    """Raised when an upload session is being completed or still written to."""
+
+
+def _sessions_dir() -> str:
+    return os.path.join(settings.upload_dir, "sessions")
+
+
+def _session_dir(upload_id: str) -> str:
+    # Only accept canonical UUIDs so ids can never escape the sessions directory
+    try:
+        upload_id = str(uuid.UUID(upload_id))
+    except ValueError:
+        raise LookupError(upload_id)
+    return os.path.join(_sessions_dir(), upload_id)
+
+
+def _chunk_count(session: Dict[str, Any]) -> int:
+    return max(1, -(-session["size"] // session["chunk_size"]))
+
+
+def _received_chunks(path: str) -> List[int]:
+    return sorted(int(name) for name in os.listdir(os.path.join(path, "chunks")))
+
+
+def _load_session(upload_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        path = _session_dir(upload_id)
+        with open(os.path.join(path, "session.json")) as f:
+            session = json.load(f)
+    except (LookupError, FileNotFoundError):
+        return None
+    if session["expires_at"] < time.time():
+        return None
+    session["received"] = _received_chunks(path)
+    return session
+
+
+def _create_session(session: Dict[str, Any]) -> None:
+    path = _session_dir(session["upload_id"])
+    os.makedirs(os.path.join(path, "chunks"))
+    os.mkdir(os.path.join(path, "writers"))
+    with open(os.path.join(path, "data"), "wb") as f:
+        f.truncate(session["size"])
+    with open(os.path.join(path, "session.json"), "w") as f:
+        json.dump(session, f)
+
+
+def _status(session: Dict[str, Any]) -> Dict[str, Any]:
+    received = set(session["received"])
+    return {
+        "upload_id": session["upload_id"],
+        "filename": session["filename"],
+        "size": session["size"],
+        "chunk_size": session["chunk_size"],
+        "chunk_count": _chunk_count(session),
+        "received_chunks": sorted(received),
+        "missing_chunks": [
+            i for i in range(_chunk_count(session)) if i not in received
+        ],
+        "expires_at": session["expires_at"],
+    }
+
+
+async def create_session(
+    filename: str,
+    size: int,
+    content_type: Optional[str] = None,
+    sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Start a resumable upload of ``size`` bytes."""
+    if size > settings.max_resumable_upload_size:
+        raise UploadTooLargeError(
+            f"File exceeds maximum size of {settings.max_resumable_upload_size} bytes"
+        )
+    session = {
+        "upload_id": str(uuid.uuid4()),
+        "filename": filename,
+        "content_type": content_type or "unknown",
+        "size": size,
+        "chunk_size": settings.upload_session_chunk_size,
+        "sha256": sha256.lower() if sha256 else None,
+        "expires_at": time.time() + settings.upload_session_ttl,
+    }
+    await asyncio.to_thread(_create_session, session)
+    session["received"] = []
+    return _status(session)
+
+
+async def get_session(upload_id: str) -> Optional[Dict[str, Any]]:
+    """Get which chunks of an upload were received and which are missing."""
+    session = await asyncio.to_thread(_load_session, upload_id)
+    return _status(session) if session else None
+
+
+async def write_chunk(
+    upload_id: str, index: int, body: AsyncIterator[bytes]
+) -> Optional[Dict[str, Any]]:
+    """Write chunk ``index`` of an upload at its offset in the data file.
+    
+    Chunks may be re-sent; a chunk only counts as received once all of its
+    bytes are on disk.
+    """
+    session = await asyncio.to_thread(_load_session, upload_id)
+    if session is None:
+        return None
+    if not 0 <= index < _chunk_count(session):
+        raise ValueError(f"Chunk index must be between 0 and {_chunk_count(session) - 1}")
+    
+    path = _session_dir(upload_id)
+    
+    def _mark_received():
+        open(os.path.join(path, "chunks", str(index)), "w").close()
+        # Writing a chunk keeps the session alive
+        session["expires_at"] = time.time() + settings.upload_session_ttl
+        descriptor = {k: v for k, v in session.items() if k != "received"}
+        fd, temp = tempfile.mkstemp(dir=path, prefix="session.json.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(descriptor, f)
+        os.replace(temp, os.path.join(path, "session.json"))
+    
+    writer = await asyncio.to_thread(_register_writer, path)
+    if writer is None:
+        return None
+    try:
+        if await asyncio.to_thread(os.path.exists, os.path.join(path, "completing")):
+            raise SessionBusyError(f"Upload '{upload_id}' is being completed")
+        written = await _write_at_offset(path, session, index, body)
+        await asyncio.to_thread(_mark_received)
+    finally:
+        await asyncio.to_thread(_remove_file, writer)
+    return {
+        "upload_id": upload_id,
+        "index": index,
+        "offset": index * session["chunk_size"],
+        "size": written,
+    }
+
+
+async def _write_at_offset(
+    path: str, session: Dict[str, Any], index: int, body: AsyncIterator[bytes]
+) -> int:
+    offset = index * session["chunk_size"]
+    expected = min(session["chunk_size"], session["size"] - offset)
+    fd = await asyncio.to_thread(os.open, os.path.join(path, "data"), os.O_WRONLY)
+    try:
+        written = 0
+        buffer = bytearray()
+        async for part in body:
+            if written + len(buffer) + len(part) > expected:
+                raise ValueError(f"Chunk {index} must be {expected} bytes")
+            buffer += part
+            if len(buffer) >= settings.upload_chunk_size:
+                await asyncio.to_thread(os.pwrite, fd, bytes(buffer), offset + written)
+                written += len(buffer)
+                buffer.clear()
+        if buffer:
+            await asyncio.to_thread(os.pwrite, fd, bytes(buffer), offset + written)
+            written += len(buffer)
+        if written != expected:
+            raise ValueError(f"Chunk {index} must be {expected} bytes, got {written}")
+    finally:
+        await asyncio.to_thread(os.close, fd)
+    return written
+
+
+def _register_writer(path: str) -> Optional[str]:
+    # Returns None if the session directory is gone
+    writers = os.path.join(path, "writers")
+    try:
+        os.mkdir(writers)
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        return None
+    writer = os.path.join(writers, uuid.uuid4().hex)
+    os.close(os.open(writer, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    return writer
+
+
+def _active_writers(path: str) -> int:
+    # Registrations older than the session TTL belong to crashed writers
+    stale_before = time.time() - settings.upload_session_ttl
+    try:
+        entries = list(os.scandir(os.path.join(path, "writers")))
+    except FileNotFoundError:
+        return 0
+    return sum(1 for entry in entries if entry.stat().st_mtime >= stale_before)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _start_completing(path: str) -> Optional[bool]:
+    # True once this caller holds the marker, False if another one does and
+    # None if the session directory is gone
+    try:
+        os.close(os.open(
+            os.path.join(path, "completing"), os.O_CREAT | os.O_EXCL | os.O_WRONLY
+        ))
+    except FileExistsError:
+        return False
+    except FileNotFoundError:
+        return None
+    return True
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(settings.upload_chunk_size)
+            if not block:
+                return digest.hexdigest()
+            digest.update(block)
+
+
+async def complete_session(upload_id: str) -> Optional[Dict[str, Any]]:
+    """Finalize an upload once all chunks are received.
+    
+    The data file is hashed in a single read pass and then renamed into the
+    content-addressed store (or discarded if the content is already stored).
+    """
+    session = await asyncio.to_thread(_load_session, upload_id)
+    if session is None:
+        return None
+    path = _session_dir(upload_id)
+    started = await asyncio.to_thread(_start_completing, path)
+    if started is None:
+        return None
+    if not started:
+        raise SessionBusyError(f"Upload '{upload_id}' is already being completed")
+    
+    try:
+        if await asyncio.to_thread(_active_writers, path):
+            raise SessionBusyError(f"Chunks of upload '{upload_id}' are still being written")
+        # Chunks may have arrived since the session was loaded
+        session["received"] = await asyncio.to_thread(_received_chunks, path)
+        missing = _status(session)["missing_chunks"]
+        if missing:
+            raise ValueError(f"Missing chunks: {missing}")
+        
+        data_path = os.path.join(path, "data")
+        digest = await asyncio.to_thread(_hash_file, data_path)
+        if session["sha256"] and digest != session["sha256"]:
+            raise ChecksumMismatchError("Uploaded content does not match the given SHA-256")
+        
+        deduplicated = await add_blob_reference(data_path, digest, session["size"])
+    except BaseException:
+        await asyncio.to_thread(_remove_file, os.path.join(path, "completing"))
+        raise
+    upload = await FileUpload.create(
+        id=f"{uuid.uuid4()}{os.path.splitext(session['filename'])[1]}",
+        blob_id=digest,
+        filename=session["filename"],
+        content_type=session["content_type"]
+    )
+    await asyncio.to_thread(shutil.rmtree, path, True)
+    
+    return {
+        "saved_as": upload.id,
+        "filename": session["filename"],
+        "size": session["size"],
+        "sha256": digest,
+        "deduplicated": deduplicated,
+        "content_type": session["content_type"],
+    }
+
+
+async def abort_session(upload_id: str) -> bool:
+    """Discard an upload session and its data."""
+    try:
+        path = _session_dir(upload_id)
+    except LookupError:
+        return False
+    if not os.path.isdir(path):
+        return False
+    await asyncio.to_thread(shutil.rmtree, path, True)
+    return True
+
+
+def purge_expired_sessions() -> int:
+    """Remove sessions that received no chunk within the session TTL."""
+    removed = 0
+    now = time.time()
+    try:
+        upload_ids = os.listdir(_sessions_dir())
+    except FileNotFoundError:
+        return 0
+    for upload_id in upload_ids:
+        path = os.path.join(_sessions_dir(), upload_id)
+        try:
+            with open(os.path.join(path, "session.json")) as f:
+                expires_at = json.load(f)["expires_at"]
+        except (OSError, ValueError, KeyError):
+            # Half-created session: fall back to the directory age
+            try:
+                expires_at = os.path.getmtime(path) + settings.upload_session_ttl
+            except OSError:
+                continue
+        if expires_at < now:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
@@ -10,7 +10,12 @@ celery_app = Celery(
     "guane_dogs",
     broker=settings.redis_url,
     backend=settings.redis_url,
-    include=["app.tasks.dog_tasks"]
+    include=[
+        "app.tasks.dog_tasks",
+        "app.tasks.file_tasks",
+        "app.tasks.heartbeat",
+        "app.tasks.metrics",
+    ]
 )
 
 # Configure Celery
@@ -21,5 +26,15 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     result_expires=3600,
+    beat_schedule={
+        "refill-image-reservoir": {
+            "task": "app.tasks.dog_tasks.refill_image_reservoir",
+            "schedule": settings.image_reservoir_refill_interval,
+        },
+        "purge-upload-sessions": {
+            "task": "app.tasks.file_tasks.purge_upload_sessions",
+            "schedule": 3600.0,
+        },
+    },
 )
 
@@ -2,61 +2,149 @@
 
 import asyncio
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List
+
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
 
 from app.tasks.celery_app import celery_app
-from app.services.external_api import get_random_dog_image
-from app.config.database import init_db, close_db
+from app.tasks.runtime import run_async
+from app.services.external_api import DEFAULT_DOG_PICTURE, get_random_dog_image
+from app.services.image_reservoir import get_dog_image, pop_images, refill_reservoir
+from app.config.settings import settings
+from app.core.metrics import observe_task_completion
 from app.models.dog import Dog
+from app.services.dog_service import DogService, constraint_error
+from app.services.task_events import publish_task_event
 
 
-@celery_app.task
-def create_dog_async(name: str, is_adopted: bool, id_user: int = None) -> Dict[str, Any]:
+@celery_app.task(bind=True)
+def create_dog_async(self, name: str, is_adopted: bool, id_user: int = None) -> Dict[str, Any]:
     """Asynchronous task to create a dog with external API call."""
+    task_id = self.request.id
+    # Stamped by the API when enqueueing
+    enqueued_at = getattr(self.request, "enqueued_at", None)
     
     async def _create_dog():
-        # Initialize database connection
-        await init_db()
+        await publish_task_event(task_id, "started")
+        try:
+            dog = await _insert_dog()
+        except Exception as e:
+            observe_task_completion(self.name, "failed", enqueued_at)
+            await publish_task_event(task_id, "failed", error=str(e))
+            raise
+        observe_task_completion(self.name, "succeeded", enqueued_at)
+        await publish_task_event(task_id, "succeeded", dog=dog)
+        return dog
+    
+    async def _insert_dog():
+        # Simulate some latency as mentioned in requirements
+        await asyncio.sleep(2)
+        
+        # Get random dog image from the prefetched reservoir
+        picture_url = await get_dog_image()
         
+        # Create dog in database; the constraints reject taken names and
+        # missing owners
         try:
-            # Simulate some latency as mentioned in requirements
-            time.sleep(2)
-            
-            # Get random dog image from external API
-            picture_url = await get_random_dog_image()
-            
-            if picture_url is None:
-                picture_url = "https://images.dog.ceo/breeds/hound-afghan/n02088094_1007.jpg"
-            
-            # Create dog in database
             dog = await Dog.create(
                 name=name,
                 picture=picture_url,
                 is_adopted=is_adopted,
                 id_user_id=id_user if id_user else None
             )
-            
-            return {
-                "id": dog.id,
-                "name": dog.name,
-                "picture": dog.picture,
-                "create_date": dog.create_date.isoformat(),
-                "is_adopted": dog.is_adopted,
-                "id_user": dog.id_user_id
-            }
+        except IntegrityError as e:
+            raise constraint_error(e, name, id_user)
+        await DogService.invalidate_cache(
+            [dog.name], [dog.id_user_id], adopted=dog.is_adopted
+        )
         
-        finally:
-            # Close database connection
-            await close_db()
+        return {
+            "id": dog.id,
+            "name": dog.name,
+            "picture": dog.picture,
+            "create_date": dog.create_date.isoformat(),
+            "is_adopted": dog.is_adopted,
+            "id_user": dog.id_user_id
+        }
     
-    # Run the async function
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(_create_dog())
-        return result
-    finally:
-        loop.close()
+    # Run on the worker's long-lived loop and connection pool
+    return run_async(_create_dog())
+
+
+@celery_app.task
+def create_dogs_bulk_async(dogs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Create a batch of dogs with one bulk insert.
+    
+    Pictures are popped from the image reservoir in one call and any shortfall
+    is fetched concurrently from dog.ceo. If the bulk insert
+    hits a constraint violation the batch falls back to per-item inserts so
+    that every dog gets its own success or failure entry.
+    """
+    
+    async def _fetch_pictures() -> List[str]:
+        pictures = await pop_images(len(dogs))
+        semaphore = asyncio.Semaphore(settings.bulk_picture_concurrency)
+        
+        async def _fetch() -> str:
+            async with semaphore:
+                return await get_random_dog_image() or DEFAULT_DOG_PICTURE
+        
+        missing = len(dogs) - len(pictures)
+        return pictures + list(await asyncio.gather(*(_fetch() for _ in range(missing))))
+    
+    async def _create_dogs():
+        pictures = await _fetch_pictures()
+        objects = [
+            Dog(
+                name=dog["name"],
+                picture=picture,
+                is_adopted=dog.get("is_adopted", False),
+                id_user_id=dog.get("id_user") or None
+            )
+            for dog, picture in zip(dogs, pictures)
+        ]
+        
+        errors = {}
+        try:
+            async with in_transaction():
+                await Dog.bulk_create(objects)
+        except IntegrityError:
+            for dog in objects:
+                try:
+                    await dog.save()
+                except IntegrityError as e:
+                    error = constraint_error(e, dog.name, dog.id_user_id)
+                    if not isinstance(error, ValueError):
+                        raise error
+                    errors[dog.name] = str(error)
+        
+        names = [dog.name for dog in objects]
+        created = [dog for dog in objects if dog.name not in errors]
+        await DogService.invalidate_cache(
+            [dog.name for dog in created],
+            {dog.id_user_id for dog in created},
+            adopted=any(dog.is_adopted for dog in created)
+        )
+        ids = dict(
+            await Dog.filter(name__in=names).values_list("name", "id")
+        )
+        return {
+            "items": [
+                {"name": name, "status": "failed", "error": errors[name]}
+                if name in errors
+                else {"name": name, "status": "created", "id": ids.get(name)}
+                for name in names
+            ]
+        }
+    
+    return run_async(_create_dogs())
+
+
+@celery_app.task
+def refill_image_reservoir() -> Dict[str, int]:
+    """Periodic task topping up the prefetched dog image reservoir."""
+    return {"added": run_async(refill_reservoir())}
 
 
 @celery_app.task
@@ -0,0 +1,12 @@
+"""Celery tasks for file operations."""
+
+from typing import Dict
+
+from app.tasks.celery_app import celery_app
+from app.services.upload_sessions import purge_expired_sessions
+
+
+@celery_app.task
+def purge_upload_sessions() -> Dict[str, int]:
+    """Periodic task removing abandoned resumable upload sessions."""
+    return {"removed": purge_expired_sessions()}
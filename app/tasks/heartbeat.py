@@ -0,0 +1,99 @@
+"""Worker heartbeats published to Redis.
+
+Each worker node runs a daemon thread that periodically writes a snapshot
+(queue depth, active tasks, last-seen time) into one Redis hash. The API reads
+that hash instead of round-tripping a task through the broker.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import redis
+from celery.signals import task_postrun, task_prerun, worker_ready, worker_shutdown
+
+from app.config.settings import settings
+from app.tasks.celery_app import celery_app
+
+HEARTBEATS_KEY = "workers:heartbeats"
+ACTIVE_TASKS_KEY = "workers:active:{hostname}"
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+_client: Optional[redis.Redis] = None
+
+
+def _get_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+    return _client
+
+
+def publish_heartbeat(hostname: str) -> None:
+    """Write the current snapshot of this worker node."""
+    client = _get_client()
+    queue_depth = client.llen(celery_app.conf.task_default_queue)
+    active_tasks = int(client.get(ACTIVE_TASKS_KEY.format(hostname=hostname)) or 0)
+    client.hset(HEARTBEATS_KEY, hostname, json.dumps({
+        "hostname": hostname,
+        "pid": os.getpid(),
+        "active_tasks": max(active_tasks, 0),
+        "queue_depth": queue_depth,
+        "last_seen": time.time(),
+    }))
+
+
+def _run(hostname: str) -> None:
+    while not _stop.is_set():
+        try:
+            publish_heartbeat(hostname)
+        except redis.RedisError as e:
+            print(f"Error publishing worker heartbeat: {e}")
+        _stop.wait(settings.worker_heartbeat_interval)
+
+
+@worker_ready.connect
+def start_heartbeat(sender=None, **kwargs) -> None:
+    """Start publishing heartbeats once the worker node is ready."""
+    global _thread
+    hostname = sender.hostname
+    _get_client().delete(ACTIVE_TASKS_KEY.format(hostname=hostname))
+    _stop.clear()
+    _thread = threading.Thread(
+        target=_run, args=(hostname,), name="worker-heartbeat", daemon=True
+    )
+    _thread.start()
+
+
+@worker_shutdown.connect
+def stop_heartbeat(sender=None, **kwargs) -> None:
+    """Stop the heartbeat thread and remove this node from the snapshot."""
+    if _thread is None:
+        return
+    _stop.set()
+    _thread.join(timeout=settings.worker_heartbeat_interval)
+    try:
+        _get_client().hdel(HEARTBEATS_KEY, sender.hostname)
+    except redis.RedisError:
+        pass
+
+
+@task_prerun.connect
+def count_task_start(task=None, **kwargs) -> None:
+    """Count a task as active on its worker node."""
+    try:
+        _get_client().incr(ACTIVE_TASKS_KEY.format(hostname=task.request.hostname))
+    except redis.RedisError:
+        pass
+
+
+@task_postrun.connect
+def count_task_end(task=None, **kwargs) -> None:
+    """Stop counting a finished task as active."""
+    try:
+        _get_client().decr(ACTIVE_TASKS_KEY.format(hostname=task.request.hostname))
+    except redis.RedisError:
+        pass
@@ -0,0 +1,29 @@
+"""Prometheus metrics server for Celery workers.
+
+The worker node serves /metrics on ``WORKER_METRICS_PORT``. With the prefork
+pool, tasks record metrics in child processes, so ``PROMETHEUS_MULTIPROC_DIR``
+must point to an empty directory shared by the node and its children.
+"""
+
+import os
+
+from celery.signals import worker_process_shutdown, worker_ready
+from prometheus_client import multiprocess, start_http_server
+
+from app.config.settings import settings
+from app.core.metrics import metrics_registry
+
+
+@worker_ready.connect
+def start_metrics_server(sender=None, **kwargs) -> None:
+    """Serve this worker node's metrics once it is ready."""
+    if not settings.metrics_enabled or not settings.worker_metrics_port:
+        return
+    start_http_server(settings.worker_metrics_port, registry=metrics_registry())
+
+
+@worker_process_shutdown.connect
+def discard_process_metrics(pid=None, **kwargs) -> None:
+    """Drop live gauges of an exiting child process in multiprocess mode."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
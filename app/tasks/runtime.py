@@ -0,0 +1,64 @@
+"""Per-process event loop and database lifecycle for Celery workers.
+
+Every worker process keeps one event loop and one Tortoise connection pool
+for its whole life instead of creating them for each task. They are set up
+from ``worker_process_init`` in prefork children and lazily on first use
+otherwise (solo/threads pools, eager mode).
+"""
+
+import asyncio
+from typing import Any, Coroutine, Optional
+
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+from app.config.database import WORKER_TORTOISE_ORM, init_db, close_db
+from app.config.redis import close_redis
+from app.services.external_api import close_http_client
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_db_ready = False
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the event loop of this worker process, creating it if needed."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def run_async(coro: Coroutine) -> Any:
+    """Run a coroutine on the worker loop with the database initialized."""
+    global _db_ready
+    loop = get_loop()
+    if not _db_ready:
+        loop.run_until_complete(init_db(WORKER_TORTOISE_ORM))
+        _db_ready = True
+    return loop.run_until_complete(coro)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs) -> None:
+    """Open the database pool once when a worker process starts."""
+    global _db_ready
+    get_loop().run_until_complete(init_db(WORKER_TORTOISE_ORM))
+    _db_ready = True
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_worker_process(**kwargs) -> None:
+    """Close the database, HTTP and Redis pools and the loop on process exit."""
+    global _loop, _db_ready
+    if _loop is None or _loop.is_closed():
+        return
+    try:
+        _loop.run_until_complete(close_http_client())
+        _loop.run_until_complete(close_redis())
+        if _db_ready:
+            _loop.run_until_complete(close_db())
+    finally:
+        _db_ready = False
+        _loop.close()
+        _loop = None
@@ -0,0 +1,15 @@
+"""Shared setup for the benchmark scripts.
+
+Imported first by each script: puts the repository root on ``sys.path`` and
+defaults the settings ``app`` needs at import time. Scripts that need other
+values set them in ``os.environ`` before importing this module.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DATABASE_URL", "sqlite://:memory:")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("SECRET_KEY", "benchmark")
\ No newline at end of file
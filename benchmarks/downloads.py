@@ -0,0 +1,87 @@
+"""Benchmark file download throughput.
+
+Compares ``RangeFileResponse`` (zero-copy when the server supports the
+``http.response.zerocopy`` extension, pread in a worker thread otherwise)
+with reading the whole file into Python and returning it as one body. Both
+run behind an in-process ASGI transport; with a real server pass ``--url``
+for each variant instead.
+
+Usage:
+    python benchmarks/downloads.py --size-mb 64 --requests 20 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import _env  # noqa: F401
+
+import httpx
+from fastapi import FastAPI, Response
+
+from app.core.responses import RangeFileResponse
+
+
+def build_app(path):
+    app = FastAPI()
+    stat = os.stat(path)
+    
+    @app.get("/range")
+    async def range_download():
+        return RangeFileResponse(
+            path=path, size=stat.st_size, last_modified=stat.st_mtime, etag='"bench"'
+        )
+    
+    @app.get("/read")
+    async def read_download():
+        with open(path, "rb") as f:
+            return Response(f.read(), media_type="application/octet-stream")
+    
+    return app
+
+
+async def measure(client, route, size, requests, concurrency, headers=None):
+    semaphore = asyncio.Semaphore(concurrency)
+    received = 0
+    
+    async def download():
+        nonlocal received
+        async with semaphore:
+            async with client.stream("GET", route, headers=headers) as response:
+                async for chunk in response.aiter_raw():
+                    received += len(chunk)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(download() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return received / elapsed / (1024 * 1024)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+    
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(os.urandom(1024 * 1024) * args.size_mb)
+        f.flush()
+        transport = httpx.ASGITransport(app=build_app(f.name))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, route, headers in (
+                ("read-into-memory", "/read", None),
+                ("range-response", "/range", None),
+                ("range-response 1/4", "/range", {"Range": f"bytes=0-{size // 4 - 1}"}),
+            ):
+                throughput = await measure(
+                    client, route, size, args.requests, args.concurrency, headers
+                )
+                print(f"{label:<20} {throughput:9.1f} MB/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
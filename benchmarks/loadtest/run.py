@@ -0,0 +1,372 @@
+"""End-to-end load test of the API against a locally started stack.
+
+Starts a stub dog.ceo server, the real app under uvicorn and (unless
+``--no-worker``) a solo-pool Celery worker. They share a throwaway SQLite
+database or ``--database-url`` (e.g. a local Postgres) and a Redis given by
+``--redis-url``, or a private ``redis-server`` started on a free port when the
+binary is installed. After seeding users and dogs, virtual users run a
+weighted mix of reads, authenticated creates, updates and uploads for
+``--duration`` seconds. Latency percentiles and throughput per endpoint are
+written as JSON so runs can be compared across releases.
+
+Usage:
+    python benchmarks/loadtest/run.py --users 50 --duration 60 --output baseline.json
+    python benchmarks/loadtest/run.py --compare baseline.json --fail-on-regression 20
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from scenarios import Session, parse_mix
+from stub_dog_ceo import start_stub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"{process.args[2]} exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Timed out waiting for {url}")
+
+
+class Stack:
+    """The processes under test and their local stand-ins."""
+
+    def __init__(self, args: argparse.Namespace, workdir: str):
+        self.args = args
+        self.workdir = workdir
+        self.processes: List[subprocess.Popen] = []
+        self.stub = None
+        self.base_url = ""
+        self.env: Dict[str, str] = {}
+
+    def _spawn(self, command: List[str]) -> subprocess.Popen:
+        process = subprocess.Popen(command, cwd=ROOT, env=self.env)
+        self.processes.append(process)
+        return process
+
+    def _redis_url(self) -> str:
+        if self.args.redis_url:
+            return self.args.redis_url
+        if shutil.which("redis-server") is None:
+            raise SystemExit("No Redis available: pass --redis-url or install redis-server")
+        port = free_port()
+        process = self._spawn([
+            "redis-server", "--port", str(port), "--save", "", "--appendonly", "no",
+            "--loglevel", "warning",
+        ])
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and process.poll() is None:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        return f"redis://127.0.0.1:{port}/0"
+
+    def start(self) -> None:
+        self.stub, dog_ceo_url = start_stub(latency_ms=self.args.stub_latency_ms)
+        database_url = self.args.database_url \
+            or f"sqlite://{os.path.join(self.workdir, 'loadtest.sqlite3')}"
+        self.env = {
+            **os.environ,
+            "PYTHONPATH": ROOT,
+            "DATABASE_URL": database_url,
+            "REDIS_URL": self._redis_url(),
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "loadtest"),
+            "DOG_CEO_API_URL": dog_ceo_url,
+            "UPLOAD_DIR": os.path.join(self.workdir, "uploads"),
+            "WORKER_METRICS_PORT": "0",
+        }
+        # Seeding and report metadata run in this process
+        os.environ.update(self.env)
+
+        port = free_port()
+        api = self._spawn([
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(self.args.api_workers), "--log-level", "warning",
+        ])
+        self.base_url = f"http://127.0.0.1:{port}"
+        wait_for(f"{self.base_url}/health", api)
+
+        if not self.args.no_worker:
+            self._spawn([
+                sys.executable, "-m", "celery", "-A", "app.tasks.celery_app", "worker",
+                "--pool", "solo", "--loglevel", "warning",
+                "--hostname", f"loadtest-{uuid.uuid4().hex[:8]}@%h",
+            ])
+
+    def stop(self) -> None:
+        for process in reversed(self.processes):
+            process.terminate()
+        for process in reversed(self.processes):
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if self.stub is not None:
+            self.stub.shutdown()
+
+
+async def seed(users: int, dogs: int) -> Session:
+    """Insert users and dogs directly so that the run starts from a known size."""
+    from app.config.database import close_db, init_db
+    from app.models.dog import Dog
+    from app.models.user import User
+
+    run = uuid.uuid4().hex[:8]
+    await init_db()
+    try:
+        await User.bulk_create([
+            User(name=f"Load{i}", last_name="Test", email=f"load-{run}-{i}@example.com")
+            for i in range(users)
+        ], batch_size=1000)
+        user_ids = await User.filter(email__startswith=f"load-{run}-").values_list(
+            "id", flat=True
+        )
+        dog_names = [f"seed-{run}-{i}" for i in range(dogs)]
+        await Dog.bulk_create([
+            Dog(
+                name=name,
+                picture="https://images.dog.ceo/breeds/stub/seed.jpg",
+                is_adopted=i % 3 == 0,
+                id_user_id=user_ids[i % len(user_ids)] if i % 3 == 0 else None,
+            )
+            for i, name in enumerate(dog_names)
+        ], batch_size=1000)
+    finally:
+        await close_db()
+    return Session(client=None, token="", dog_names=dog_names, user_ids=list(user_ids))
+
+
+class Recorder:
+    """Latency samples and failures per endpoint label."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    def record(self, label: str, elapsed: float, status: Optional[int]) -> None:
+        if not self.recording:
+            return
+        self.latencies[label].append(elapsed)
+        self.statuses[label][str(status) if status else "error"] += 1
+        if status is None or status >= 400:
+            self.errors[label] += 1
+
+
+async def virtual_user(
+    session: Session, mix: Dict[str, Any], deadline: float, think_time: float,
+    recorder: Recorder
+) -> None:
+    scenarios = [scenario for _, scenario in mix.values()]
+    weights = [weight for weight, _ in mix.values()]
+    while time.perf_counter() < deadline:
+        scenario = random.choices(scenarios, weights)[0]
+        start = time.perf_counter()
+        try:
+            status = (await scenario(session)).status_code
+        except httpx.HTTPError:
+            status = None
+        recorder.record(scenario.label, time.perf_counter() - start, status)
+        if think_time:
+            await asyncio.sleep(random.expovariate(1 / think_time))
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted ``samples``."""
+    return samples[max(math.ceil(q * len(samples)) - 1, 0)]
+
+
+def summarize(samples: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    samples = sorted(samples)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput_rps": round(len(samples) / elapsed, 2),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+    }
+
+
+async def run_load(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    session = await seed(args.seed_users, args.seed_dogs)
+    session.upload_size = args.upload_kb * 1024
+    mix = parse_mix(args.mix)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        session.client = client
+        response = await client.post(
+            "/api/auth/login", json={"username": "admin", "password": "secret"}
+        )
+        response.raise_for_status()
+        session.token = response.json()["access_token"]
+
+        start = time.perf_counter()
+        deadline = start + args.warmup + args.duration
+        users = [
+            asyncio.create_task(
+                virtual_user(session, mix, deadline, args.think_time, recorder)
+            )
+            for _ in range(args.users)
+        ]
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+        measured_from = time.perf_counter()
+        await asyncio.gather(*users)
+        elapsed = time.perf_counter() - measured_from
+
+    all_samples = [s for samples in recorder.latencies.values() for s in samples]
+    return {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+            "worker": not args.no_worker,
+            "api_workers": args.api_workers,
+            "users": args.users,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "think_time_s": args.think_time,
+            "stub_latency_ms": args.stub_latency_ms,
+            "seed_users": args.seed_users,
+            "seed_dogs": args.seed_dogs,
+            "mix": {name: weight for name, (weight, _) in mix.items()},
+        },
+        "endpoints": {
+            label: {
+                **summarize(samples, recorder.errors[label], elapsed),
+                "statuses": dict(recorder.statuses[label]),
+            }
+            for label, samples in sorted(recorder.latencies.items())
+        },
+        "total": summarize(all_samples, sum(recorder.errors.values()), elapsed)
+        if all_samples else {},
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"{'endpoint':<28} {'reqs':>7} {'err':>5} {'rps':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, stats in [*report["endpoints"].items(), ("total", report["total"])]:
+        if not stats:
+            continue
+        print(f"{label:<28} {stats['requests']:>7} {stats['errors']:>5} "
+              f"{stats['throughput_rps']:>8.1f} {stats['p50_ms']:>8.1f} "
+              f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+
+
+def compare(baseline: Dict[str, Any], report: Dict[str, Any], threshold: Optional[float]) -> bool:
+    """Print changes against ``baseline``; False if a p95 regressed past ``threshold`` %."""
+    ok = True
+    print(f"\n{'vs baseline':<28} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for label, stats in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(label)
+        if not before:
+            continue
+        changes = {
+            key: (stats[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+        }
+        print(f"{label:<28} " + " ".join(f"{change:>+8.1f}%" for change in changes.values()))
+        if threshold is not None and changes["p95_ms"] > threshold:
+            ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds first")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="mean pause between a user's requests, in seconds")
+    parser.add_argument("--mix", default="",
+                        help="scenario weights to override, e.g. upload_file=0,create_dog=20")
+    parser.add_argument("--seed-users", type=int, default=200)
+    parser.add_argument("--seed-dogs", type=int, default=2000)
+    parser.add_argument("--upload-kb", type=int, default=64)
+    parser.add_argument("--database-url", help="defaults to a throwaway SQLite file")
+    parser.add_argument("--redis-url", help="defaults to a private redis-server")
+    parser.add_argument("--stub-latency-ms", type=float, default=50.0,
+                        help="delay of the stub dog.ceo responses")
+    parser.add_argument("--api-workers", type=int, default=1)
+    parser.add_argument("--no-worker", action="store_true",
+                        help="do not start a Celery worker; creates stay queued")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--fail-on-regression", type=float,
+                        help="exit 1 if any endpoint's p95 grew by more than this %%")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as workdir:
+        stack = Stack(args, workdir)
+        try:
+            stack.start()
+            report = asyncio.run(run_load(args, stack.base_url))
+        finally:
+            stack.stop()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if not compare(baseline, report, args.fail_on_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Request mix driven by each virtual user of the load test.
+
+Every scenario issues one request and returns the response. Results are
+reported under the scenario's endpoint label (method and route template).
+Scenarios are picked at random according to their weight.
+"""
+
+import os
+import random
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Tuple, TypeVar
+
+import httpx
+
+
+@dataclass
+class Session:
+    """State shared by the virtual users: client, token and known records."""
+    client: httpx.AsyncClient
+    token: str
+    dog_names: List[str] = field(default_factory=list)
+    user_ids: List[int] = field(default_factory=list)
+    upload_size: int = 64 * 1024
+
+    @property
+    def auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+Scenario = Callable[[Session], Awaitable[httpx.Response]]
+F = TypeVar("F", bound=Scenario)
+
+
+def endpoint(label: str) -> Callable[[F], F]:
+    """Set the endpoint label a scenario is reported under."""
+    def decorator(scenario: F) -> F:
+        scenario.label = label
+        return scenario
+    return decorator
+
+
+@endpoint("GET /api/dogs/")
+async def list_dogs(session: Session) -> httpx.Response:
+    return await session.client.get("/api/dogs/", params={"limit": 50})
+
+
+@endpoint("GET /api/dogs/is_adopted")
+async def list_adopted_dogs(session: Session) -> httpx.Response:
+    return await session.client.get(
+        "/api/dogs/is_adopted", params={"limit": 50, "include": "user"}
+    )
+
+
+@endpoint("GET /api/dogs/{name}")
+async def get_dog(session: Session) -> httpx.Response:
+    name = random.choice(session.dog_names)
+    return await session.client.get(f"/api/dogs/{name}")
+
+
+@endpoint("GET /api/users/")
+async def list_users(session: Session) -> httpx.Response:
+    return await session.client.get(
+        "/api/users/", params={"limit": 50, "include": "dogs"}
+    )
+
+
+@endpoint("GET /api/users/{user_id}")
+async def get_user(session: Session) -> httpx.Response:
+    user_id = random.choice(session.user_ids)
+    return await session.client.get(f"/api/users/{user_id}")
+
+
+@endpoint("GET /api/dogs/search")
+async def search_dogs(session: Session) -> httpx.Response:
+    name = random.choice(session.dog_names)
+    # Drop a character to exercise typo-tolerant matching
+    typo = name[:len(name) // 2] + name[len(name) // 2 + 1:]
+    return await session.client.get("/api/dogs/search", params={"q": typo or name})
+
+
+@endpoint("GET /api/dogs/search?mode=prefix")
+async def autocomplete_dogs(session: Session) -> httpx.Response:
+    name = random.choice(session.dog_names)
+    prefix = name[:random.randint(1, len(name))]
+    return await session.client.get(
+        "/api/dogs/search", params={"q": prefix, "mode": "prefix"}
+    )
+
+
+@endpoint("POST /api/dogs/{name}")
+async def create_dog(session: Session) -> httpx.Response:
+    name = f"load-{uuid.uuid4().hex[:12]}"
+    return await session.client.post(
+        f"/api/dogs/{name}",
+        json={"name": name, "is_adopted": False},
+        headers=session.auth
+    )
+
+
+@endpoint("PUT /api/dogs/{name}")
+async def update_dog(session: Session) -> httpx.Response:
+    name = random.choice(session.dog_names)
+    adopted = random.random() < 0.5
+    return await session.client.put(
+        f"/api/dogs/{name}",
+        json={
+            "is_adopted": adopted,
+            "id_user": random.choice(session.user_ids) if adopted else None
+        }
+    )
+
+
+@endpoint("POST /api/files")
+async def upload_file(session: Session) -> httpx.Response:
+    payload = os.urandom(session.upload_size)
+    return await session.client.post(
+        "/api/files",
+        files={"file": (f"{uuid.uuid4().hex}.bin", payload, "application/octet-stream")}
+    )
+
+
+# Scenario name -> (weight, scenario); weights are relative
+DEFAULT_MIX: Dict[str, Tuple[int, Scenario]] = {
+    "list_dogs": (25, list_dogs),
+    "list_adopted_dogs": (10, list_adopted_dogs),
+    "get_dog": (20, get_dog),
+    "list_users": (10, list_users),
+    "get_user": (10, get_user),
+    "create_dog": (10, create_dog),
+    "update_dog": (10, update_dog),
+    "upload_file": (5, upload_file),
+    # Off by default to keep reports comparable; enable with --mix
+    "search_dogs": (0, search_dogs),
+    "autocomplete_dogs": (0, autocomplete_dogs),
+}
+
+
+def parse_mix(spec: str) -> Dict[str, Tuple[int, Scenario]]:
+    """Override weights from ``name=weight,...``; unnamed scenarios keep theirs."""
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown scenario '{name}'")
+        mix[name] = (int(weight), DEFAULT_MIX[name][1])
+    return {name: entry for name, entry in mix.items() if entry[0] > 0}
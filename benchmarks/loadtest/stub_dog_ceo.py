@@ -0,0 +1,81 @@
+"""Local stand-in for the dog.ceo random image API.
+
+Serves ``/api/breeds/image/random`` and ``/api/breeds/image/random/<n>`` with
+the same response shape as dog.ceo, after an optional fixed delay, so load
+tests exercise the real HTTP client without depending on the live service.
+
+Usage:
+    python benchmarks/loadtest/stub_dog_ceo.py --port 8081 --latency-ms 50
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+RANDOM_PATH = "/api/breeds/image/random"
+MAX_IMAGES = 50
+
+
+def _image_url() -> str:
+    return f"https://images.dog.ceo/breeds/stub/{uuid.uuid4().hex}.jpg"
+
+
+class DogCeoHandler(BaseHTTPRequestHandler):
+    """Answer random image requests like dog.ceo does."""
+
+    latency = 0.0
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == RANDOM_PATH:
+            message = _image_url()
+        elif path.startswith(RANDOM_PATH + "/") and path.rsplit("/", 1)[1].isdigit():
+            count = min(int(path.rsplit("/", 1)[1]), MAX_IMAGES)
+            message = [_image_url() for _ in range(count)]
+        else:
+            self.send_error(404)
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+        body = json.dumps({"message": message, "status": "success"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(port: int = 0, latency_ms: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub in a daemon thread and return the server and its API URL."""
+    handler = type("StubHandler", (DogCeoHandler,), {"latency": latency_ms / 1000})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-dog-ceo", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}{RANDOM_PATH}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, url = start_stub(args.port, args.latency_ms)
+    print(f"Serving {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
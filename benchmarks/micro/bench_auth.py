@@ -0,0 +1,19 @@
+"""JWT creation and verification."""
+
+from app.core.auth import decode_access_token, decode_access_token_cached, token_cache
+from app.core.security import create_access_token
+
+
+def bench_create_access_token(benchmark):
+    assert benchmark(create_access_token, "admin")
+
+
+def bench_decode_access_token(benchmark):
+    token = create_access_token("admin")
+    assert benchmark(decode_access_token, token) == "admin"
+
+
+def bench_decode_access_token_cached(benchmark):
+    token = create_access_token("admin")
+    token_cache.clear()
+    assert benchmark(decode_access_token_cached, token) == "admin"
@@ -0,0 +1,37 @@
+"""DogService reads and writes against the seeded in-memory database."""
+
+import itertools
+
+import pytest
+
+from app.schemas.dog import DogUpdate
+from app.services.dog_service import DogInclude, DogService
+
+
+@pytest.mark.parametrize("limit", [50, 500])
+def bench_get_all_dogs(benchmark, run, db, limit):
+    page = benchmark(run, DogService.get_all_dogs, limit=limit)
+    assert len(page["items"]) == limit
+
+
+@pytest.mark.parametrize("limit", [50, 500])
+def bench_get_all_dogs_include_user(benchmark, run, db, limit):
+    page = benchmark(run, DogService.get_all_dogs, limit=limit, include=DogInclude.user)
+    assert "user" in page["items"][0]
+
+
+@pytest.mark.parametrize("limit", [50, 500])
+def bench_get_adopted_dogs(benchmark, run, db, limit):
+    page = benchmark(run, DogService.get_adopted_dogs, limit=limit)
+    assert all(dog["is_adopted"] for dog in page["items"])
+
+
+def bench_update_dog(benchmark, run, db):
+    updates = itertools.cycle([
+        DogUpdate(is_adopted=False, id_user=None), DogUpdate(is_adopted=True, id_user=1)
+    ])
+    
+    def _update():
+        return run(DogService.update_dog, "dog-1", next(updates))
+    
+    assert benchmark(_update) is not None
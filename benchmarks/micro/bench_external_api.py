@@ -0,0 +1,30 @@
+"""dog.ceo client calls against a stub transport, measuring client overhead."""
+
+import httpx
+import pytest
+
+from app.services import external_api
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    count = request.url.path.rsplit("/", 1)[-1]
+    image = "https://images.dog.ceo/breeds/stub/1.jpg"
+    message = [image] * int(count) if count.isdigit() else image
+    return httpx.Response(200, json={"message": message, "status": "success"})
+
+
+@pytest.fixture
+def stub_client(run):
+    previous = external_api._client
+    external_api._client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    yield
+    run(external_api.close_http_client)
+    external_api._client = previous
+
+
+def bench_get_random_dog_image(benchmark, run, stub_client):
+    assert benchmark(run, external_api.get_random_dog_image)
+
+
+def bench_get_random_dog_images(benchmark, run, stub_client):
+    assert len(benchmark(run, external_api.get_random_dog_images, 50)) == 50
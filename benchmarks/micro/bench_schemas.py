@@ -0,0 +1,36 @@
+"""Response schema validation from ORM instances at different sizes."""
+
+import pytest
+
+from app.models.dog import Dog
+from app.models.user import User
+from app.schemas.dog import DogResponse
+from app.schemas.user import UserWithDogs
+
+
+@pytest.mark.parametrize("count", [1, 100, 1000])
+def bench_dog_response_from_orm(benchmark, run, db, count):
+    dogs = run(Dog.all().order_by("id").limit(count).all)
+    
+    def _validate():
+        return [DogResponse.from_orm(dog) for dog in dogs]
+    
+    assert len(benchmark(_validate)) == count
+
+
+@pytest.mark.parametrize("dogs", [0, 10, 100])
+def bench_user_with_dogs_from_orm(benchmark, run, db, dogs):
+    async def _user():
+        user = await User.create(
+            name="Owner", last_name="Bench", email=f"owner-{dogs}@example.com"
+        )
+        await Dog.bulk_create([
+            Dog(name=f"owned-{dogs}-{i}", picture="p", is_adopted=True, id_user=user)
+            for i in range(dogs)
+        ])
+        await user.fetch_related("dogs")
+        return user
+    
+    user = run(_user)
+    result = benchmark(UserWithDogs.from_orm, user)
+    assert len(result.dogs) == dogs
@@ -0,0 +1,97 @@
+"""Benchmark list response serialization.
+
+Compares the previous path (model instances validated with ``from_orm`` into a
+``Page`` and validated again by ``response_model`` before ``json.dumps``)
+with the fast path (``.values()`` rows encoded by ``ORJSONResponse``) for
+pages of 1k, 10k and 100k dogs on an in-memory SQLite database.
+
+Usage:
+    python benchmarks/serialization.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import _env  # noqa: F401
+
+from fastapi.encoders import jsonable_encoder
+from tortoise import Tortoise
+
+from app.config.database import close_db
+from app.core.responses import ORJSONResponse
+from app.models.dog import Dog
+from app.models.user import User
+from app.schemas.dog import DOG_RESPONSE_COLUMNS, DogResponse
+from app.schemas.pagination import Page
+
+
+async def seed(count):
+    user = await User.create(name="Bench", last_name="Mark", email="bench@example.com")
+    await Dog.bulk_create(
+        [
+            Dog(
+                name=f"dog-{i}",
+                picture=f"https://images.dog.ceo/breeds/hound/{i}.jpg",
+                is_adopted=i % 2 == 0,
+                id_user_id=user.id if i % 2 == 0 else None,
+            )
+            for i in range(count)
+        ],
+        batch_size=1000
+    )
+
+
+async def model_path(limit):
+    dogs = await Dog.all().order_by("id").limit(limit)
+    page = Page[DogResponse](
+        items=[DogResponse.from_orm(dog) for dog in dogs], next_cursor=None
+    )
+    # What FastAPI does with response_model before encoding
+    validated = Page[DogResponse].model_validate(page.model_dump())
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+async def values_path(limit):
+    dogs = await Dog.all().order_by("id").limit(limit).values(**DOG_RESPONSE_COLUMNS)
+    return ORJSONResponse({"items": dogs, "next_cursor": None}).body
+
+
+async def measure(func, limit, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = await func(limit)
+        best = min(best, time.perf_counter() - start)
+    return best, len(body)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    await Tortoise.init(
+        db_url=os.environ["DATABASE_URL"], modules={"models": ["app.models.dog", "app.models.user"]}
+    )
+    await Tortoise.generate_schemas()
+    await seed(max(args.sizes))
+
+    print(f"{'rows':>8} {'from_orm ms':>12} {'values ms':>10} {'speedup':>8}")
+    try:
+        for size in args.sizes:
+            slow, slow_bytes = await measure(model_path, size, args.repeat)
+            fast, fast_bytes = await measure(values_path, size, args.repeat)
+            print(
+                f"{size:>8} {slow * 1000:>12.1f} {fast * 1000:>10.1f} {slow / fast:>7.1f}x"
+                f"  ({slow_bytes} / {fast_bytes} bytes)"
+            )
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
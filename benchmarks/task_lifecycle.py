@@ -0,0 +1,74 @@
+"""Benchmark per-task vs per-process database lifecycle for Celery tasks.
+
+Compares the old task pattern (new event loop, ``init_db()`` and
+``close_db()`` for every task) with the long-lived worker runtime in
+``app.tasks.runtime``. Both variants insert one dog per task so the numbers
+reflect lifecycle overhead rather than dog.ceo latency.
+
+Usage:
+    DATABASE_URL=postgres://... python benchmarks/task_lifecycle.py --tasks 200
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+# Tasks open their own connections, so the database must outlive one of them
+os.environ.setdefault("DATABASE_URL", "sqlite://benchmark_tasks.sqlite3")
+import _env  # noqa: F401,E402
+
+from app.config.database import init_db, close_db  # noqa: E402
+from app.models.dog import Dog  # noqa: E402
+from app.tasks import runtime  # noqa: E402
+
+
+async def _insert_dog():
+    await Dog.create(name=f"bench-{uuid.uuid4()}", picture="bench")
+
+
+def per_task_lifecycle():
+    """One task run the way tasks used to: fresh loop and connection."""
+    async def _task():
+        await init_db()
+        try:
+            await _insert_dog()
+        finally:
+            await close_db()
+    
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(_task())
+    finally:
+        loop.close()
+
+
+def persistent_lifecycle():
+    """One task run on the long-lived worker loop and pool."""
+    runtime.run_async(_insert_dog())
+
+
+def measure(label, task, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        task()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {count} tasks in {elapsed:.2f}s -> {count / elapsed:.1f} tasks/s")
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200)
+    args = parser.parse_args()
+    
+    before = measure("per-task", per_task_lifecycle, args.tasks)
+    after = measure("persistent", persistent_lifecycle, args.tasks)
+    runtime.shutdown_worker_process()
+    print(f"speedup: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark peak RSS and concurrent throughput of file uploads.
+
+Runs the previous read-everything upload handler and the streaming
+``upload_file`` route in separate subprocesses (peak RSS is per process) and
+drives each with concurrent multipart uploads through an in-process ASGI
+transport.
+
+Usage:
+    python benchmarks/uploads.py --size-mb 64 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import _env  # noqa: F401
+
+
+def build_app(mode, upload_dir):
+    from fastapi import FastAPI, File, UploadFile
+    
+    from app.api.routes import files
+    from app.config.settings import settings
+    
+    settings.upload_dir = upload_dir
+    settings.max_upload_size = 1 << 40
+    app = FastAPI()
+    if mode == "streaming":
+        app.include_router(files.router, prefix="/api")
+        return app
+    
+    @app.post("/api/files")
+    async def legacy_upload(file: UploadFile = File(...)):
+        content = await file.read()
+        with open(os.path.join(upload_dir, file.filename), "wb") as f:
+            f.write(content)
+        return {"size": len(content)}
+    
+    return app
+
+
+async def run_mode(mode, size, concurrency):
+    import httpx
+    
+    from app.config.database import init_db, close_db
+    
+    with tempfile.TemporaryDirectory() as upload_dir:
+        app = build_app(mode, upload_dir)
+        await init_db()
+        payload_path = os.path.join(upload_dir, "payload.bin")
+        with open(payload_path, "wb") as f:
+            f.write(os.urandom(1024 * 1024) * (size // (1024 * 1024)))
+        
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def upload(i):
+                with open(payload_path, "rb") as f:
+                    response = await client.post(
+                        "/api/files", files={"file": (f"upload-{i}.bin", f)}
+                    )
+                response.raise_for_status()
+            
+            start = time.perf_counter()
+            await asyncio.gather(*(upload(i) for i in range(concurrency)))
+            elapsed = time.perf_counter() - start
+        await close_db()
+    
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "mode": mode,
+        "peak_rss_mb": round(peak_rss_mb, 1),
+        "uploads_per_s": round(concurrency / elapsed, 2),
+        "mb_per_s": round(concurrency * size / elapsed / (1024 * 1024), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mode", choices=["legacy", "streaming"])
+    args = parser.parse_args()
+    size = args.size_mb * 1024 * 1024
+    
+    if args.mode:
+        print(json.dumps(asyncio.run(run_mode(args.mode, size, args.concurrency))))
+        return
+    
+    for mode in ("legacy", "streaming"):
+        output = subprocess.check_output([
+            sys.executable, __file__, "--mode", mode,
+            "--size-mb", str(args.size_mb), "--concurrency", str(args.concurrency),
+        ])
+        result = json.loads(output.decode().strip().splitlines()[-1])
+        print(
+            f"{mode:<10} peak RSS {result['peak_rss_mb']:8.1f} MB  "
+            f"{result['uploads_per_s']:6.2f} uploads/s  {result['mb_per_s']:7.1f} MB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
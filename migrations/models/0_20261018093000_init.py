@@ -0,0 +1,52 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "users" (
+            "id" SERIAL NOT NULL PRIMARY KEY,
+            "name" VARCHAR(100) NOT NULL,
+            "last_name" VARCHAR(100) NOT NULL,
+            "email" VARCHAR(255) NOT NULL UNIQUE,
+            "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+            "updated_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP
+        );
+        COMMENT ON TABLE "users" IS 'User model for storing user information.';
+        CREATE TABLE IF NOT EXISTS "dogs" (
+            "id" SERIAL NOT NULL PRIMARY KEY,
+            "name" VARCHAR(100) NOT NULL UNIQUE,
+            "picture" TEXT NOT NULL,
+            "create_date" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+            "is_adopted" BOOL NOT NULL  DEFAULT False,
+            "id_user_id" INT REFERENCES "users" ("id") ON DELETE SET NULL
+        );
+        COMMENT ON TABLE "dogs" IS 'Dog model for storing dog information.';
+        CREATE TABLE IF NOT EXISTS "file_blobs" (
+            "digest" VARCHAR(64) NOT NULL  PRIMARY KEY,
+            "size" BIGINT NOT NULL,
+            "ref_count" INT NOT NULL  DEFAULT 0,
+            "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP
+        );
+        COMMENT ON TABLE "file_blobs" IS 'Content-addressed file contents, stored once per distinct SHA-256.';
+        CREATE TABLE IF NOT EXISTS "file_uploads" (
+            "id" VARCHAR(100) NOT NULL  PRIMARY KEY,
+            "filename" VARCHAR(255) NOT NULL,
+            "content_type" VARCHAR(255) NOT NULL,
+            "created_at" TIMESTAMPTZ NOT NULL  DEFAULT CURRENT_TIMESTAMP,
+            "blob_id" VARCHAR(64) NOT NULL REFERENCES "file_blobs" ("digest") ON DELETE RESTRICT
+        );
+        COMMENT ON TABLE "file_uploads" IS 'A single upload, pointing at the blob holding its contents.';
+        CREATE TABLE IF NOT EXISTS "aerich" (
+            "id" SERIAL NOT NULL PRIMARY KEY,
+            "version" VARCHAR(255) NOT NULL,
+            "app" VARCHAR(100) NOT NULL,
+            "content" JSONB NOT NULL
+        );"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "file_uploads";
+        DROP TABLE IF EXISTS "file_blobs";
+        DROP TABLE IF EXISTS "dogs";
+        DROP TABLE IF EXISTS "users";"""
@@ -0,0 +1,14 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS "idx_dogs_name_trgm" ON "dogs" USING GIN ("name" gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS "idx_dogs_name_lower_prefix" ON "dogs" ((LOWER("name")) COLLATE "C");"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_dogs_name_lower_prefix";
+        DROP INDEX IF EXISTS "idx_dogs_name_trgm";"""